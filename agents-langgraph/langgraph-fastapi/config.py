@@ -0,0 +1,55 @@
+"""
+Configuration for the FastAPI LangGraph API.
+
+Environment variables are read once at import time into a frozen Config
+instance so every module shares the same validated settings.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+
+def _validate_url(name: str, value: Optional[str]) -> None:
+    """Raise ValueError unless value is an absolute http(s) URL."""
+    parsed = urlparse(value or "")
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        raise ValueError(f"{name} must be an http(s) URL, got: {value!r}")
+
+
+@dataclass(frozen=True)
+class Config:
+    base_url: str
+    inference_model: Optional[str]
+    api_key: Optional[str]
+    customer_mcp_server_url: str
+    finance_mcp_server_url: str
+    fastapi_host: str = "0.0.0.0"
+    fastapi_port: int = 8000
+    skip_llm_probe: bool = False
+
+    def __post_init__(self):
+        _validate_url("LLAMA_STACK_BASE_URL", self.base_url)
+        _validate_url("CUSTOMER_MCP_SERVER_URL", self.customer_mcp_server_url)
+        _validate_url("FINANCE_MCP_SERVER_URL", self.finance_mcp_server_url)
+
+
+def load_config() -> Config:
+    """Load .env and build the Config from environment variables."""
+    load_dotenv()
+    return Config(
+        base_url=os.getenv("LLAMA_STACK_BASE_URL"),
+        inference_model=os.getenv("INFERENCE_MODEL"),
+        api_key=os.getenv("API_KEY"),
+        customer_mcp_server_url=os.getenv("CUSTOMER_MCP_SERVER_URL"),
+        finance_mcp_server_url=os.getenv("FINANCE_MCP_SERVER_URL"),
+        fastapi_host=os.getenv("FASTAPI_HOST", "0.0.0.0"),
+        fastapi_port=int(os.getenv("FASTAPI_PORT", "8000")),
+        skip_llm_probe=os.getenv("SKIP_LLM_PROBE") == "1",
+    )
+
+
+CONFIG = load_config()
@@ -3,15 +3,23 @@
 Load test script for the FastAPI LangGraph API.
 """
 
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import time
-import concurrent.futures
 import argparse
 import statistics
+import json
 import os
 import logging
 from urllib.parse import urlencode
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,11 +27,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Suppress noisy httpx logging
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 # Default configuration
 SERVICE_URL = os.getenv("SERVICE_URL", "langgraph-fastapi")
 DEFAULT_BASE_URL = f"http://{SERVICE_URL}:8000"
 DEFAULT_CONCURRENT_USERS = 3
 DEFAULT_ITERATIONS = 1
+CHUNK_SIZE = 4096
 
 # Test queries based on the curl commands
 QUERIES = [
@@ -36,7 +48,27 @@ QUERIES = [
 ]
 
 
-def make_request(base_url: str, query: str) -> dict:
+def create_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive session so sequential requests reuse one socket."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size * 2,
+        max_retries=0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def decode_body(status_code: int, body: bytes):
+    """Decode a buffered response body into JSON on success, text otherwise."""
+    if status_code == 200:
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+def make_request(session: requests.Session, base_url: str, query: str) -> dict:
     """Make a single request to the /question endpoint."""
     url = f"{base_url}/question"
     params = {"q": query}
@@ -44,74 +76,153 @@ def make_request(base_url: str, query: str) -> dict:
     logger.debug(f"Sending request: {query}")
     start_time = time.time()
     try:
-        response = requests.get(url, params=params, timeout=120)
+        ttft = None
+        chunks = []
+        with session.get(url, params=params, timeout=120, stream=True) as response:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if ttft is None:
+                    ttft = time.time() - start_time
+                chunks.append(chunk)
         elapsed = time.time() - start_time
 
-        response_data = response.json() if response.status_code == 200 else response.text
+        response_data = decode_body(response.status_code, b"".join(chunks))
         logger.debug(f"Response for '{query[:40]}...': {response_data}")
 
         return {
             "query": query,
             "status_code": response.status_code,
             "elapsed": elapsed,
+            "ttft": ttft,
             "success": response.status_code == 200,
             "response": response_data,
             "error": None
         }
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         elapsed = time.time() - start_time
         logger.debug(f"Request failed for '{query[:40]}...': {e}")
         return {
             "query": query,
             "status_code": None,
             "elapsed": elapsed,
+            "ttft": None,
             "success": False,
             "response": None,
             "error": str(e)
         }
 
 
-def run_sequential_test(base_url: str, queries: list) -> list:
+async def make_request_async(client: httpx.AsyncClient, base_url: str, query: str) -> dict:
+    """Make a single non-blocking request to the /question endpoint."""
+    url = f"{base_url}/question"
+    params = {"q": query}
+
+    logger.debug(f"Sending request: {query}")
+    start_time = time.time()
+    try:
+        ttft = None
+        chunks = []
+        async with client.stream("GET", url, params=params, timeout=120) as response:
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                if ttft is None:
+                    ttft = time.time() - start_time
+                chunks.append(chunk)
+        elapsed = time.time() - start_time
+
+        response_data = decode_body(response.status_code, b"".join(chunks))
+        logger.debug(f"Response for '{query[:40]}...': {response_data}")
+
+        return {
+            "query": query,
+            "status_code": response.status_code,
+            "elapsed": elapsed,
+            "ttft": ttft,
+            "success": response.status_code == 200,
+            "response": response_data,
+            "error": None
+        }
+    except (httpx.HTTPError, ValueError) as e:
+        elapsed = time.time() - start_time
+        logger.debug(f"Request failed for '{query[:40]}...': {e}")
+        return {
+            "query": query,
+            "status_code": None,
+            "elapsed": elapsed,
+            "ttft": None,
+            "success": False,
+            "response": None,
+            "error": str(e)
+        }
+
+
+def run_sequential_test(session: requests.Session, base_url: str, queries: list) -> list:
     """Run queries sequentially."""
     results = []
     for query in queries:
         print(f"  Sending: {query[:50]}...")
-        result = make_request(base_url, query)
+        result = make_request(session, base_url, query)
         status = "✓" if result["success"] else "✗"
         print(f"  {status} {result['elapsed']:.2f}s - Status: {result['status_code']}")
         results.append(result)
     return results
 
 
-def run_concurrent_test(base_url: str, queries: list, max_workers: int) -> list:
-    """Run queries concurrently."""
+async def run_concurrent_test(base_url: str, queries: list, max_workers: int) -> list:
+    """Run queries through a bounded queue drained by max_workers workers."""
     results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_query = {
-            executor.submit(make_request, base_url, query): query
-            for query in queries
-        }
+    queue = asyncio.Queue(maxsize=max_workers * 2)
+    semaphore = asyncio.Semaphore(max_workers)
+    limits = httpx.Limits(
+        max_connections=max_workers * 4,
+        max_keepalive_connections=max_workers * 2
+    )
 
-        for future in concurrent.futures.as_completed(future_to_query):
-            query = future_to_query[future]
-            try:
-                result = future.result()
-                status = "✓" if result["success"] else "✗"
-                print(f"  {status} {result['elapsed']:.2f}s - {query[:40]}...")
-                results.append(result)
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
-                results.append({
-                    "query": query,
-                    "status_code": None,
-                    "elapsed": 0,
-                    "success": False,
-                    "response": None,
-                    "error": str(e)
-                })
+    async def run_one(client: httpx.AsyncClient, query: str) -> dict:
+        try:
+            async with semaphore:
+                result = await make_request_async(client, base_url, query)
+        except Exception as e:
+            result = {
+                "query": query,
+                "status_code": None,
+                "elapsed": 0,
+                "ttft": None,
+                "success": False,
+                "response": None,
+                "error": str(e)
+            }
+            print(f"  ✗ Error: {e}")
+            return result
+        status = "✓" if result["success"] else "✗"
+        print(f"  {status} {result['elapsed']:.2f}s - {query[:40]}...")
+        return result
+
+    async def producer():
+        for query in queries:
+            await queue.put(query)
+        # One sentinel per worker signals there is no more work
+        for _ in range(max_workers):
+            await queue.put(None)
+
+    async def worker(client: httpx.AsyncClient):
+        while True:
+            query = await queue.get()
+            if query is None:
+                break
+            results.append(await run_one(client, query))
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(producer(), *(worker(client) for _ in range(max_workers)))
     return results
 
 
+def percentiles(values: list, points: tuple) -> list:
+    """Return the requested percentiles of a non-empty list in one quantiles pass."""
+    if len(values) == 1:
+        return [values[0]] * len(points)
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return [cuts[p - 1] for p in points]
+
+
 def print_summary(results: list, total_time: float):
     """Print test summary statistics."""
     print("\n" + "=" * 60)
@@ -127,15 +238,27 @@ def print_summary(results: list, total_time: float):
     print(f"Total time:         {total_time:.2f}s")
 
     if successful:
-        times = [r["elapsed"] for r in successful]
+        times = sorted(r["elapsed"] for r in successful)
+        p50, p90, p95, p99 = percentiles(times, (50, 90, 95, 99))
         print(f"\nResponse times (successful requests):")
-        print(f"  Min:              {min(times):.2f}s")
-        print(f"  Max:              {max(times):.2f}s")
-        print(f"  Average:          {statistics.mean(times):.2f}s")
+        print(f"  Min:              {times[0]:.2f}s")
+        print(f"  Max:              {times[-1]:.2f}s")
+        print(f"  Average:          {statistics.fmean(times):.2f}s")
         if len(times) > 1:
             print(f"  Std Dev:          {statistics.stdev(times):.2f}s")
+        print(f"  p50:              {p50:.2f}s")
+        print(f"  p90:              {p90:.2f}s")
+        print(f"  p95:              {p95:.2f}s")
+        print(f"  p99:              {p99:.2f}s")
         print(f"  Requests/sec:     {len(successful) / total_time:.2f}")
 
+        ttfts = sorted(r["ttft"] for r in successful if r["ttft"] is not None)
+        if ttfts:
+            ttft_p50, ttft_p95 = percentiles(ttfts, (50, 95))
+            print(f"\nTime to first byte (successful requests):")
+            print(f"  p50:              {ttft_p50:.2f}s")
+            print(f"  p95:              {ttft_p95:.2f}s")
+
     if failed:
         print(f"\nFailed requests:")
         for r in failed:
@@ -200,14 +323,18 @@ def main():
     print("=" * 60)
     print()
 
+    # Reuse one keep-alive session for the connectivity check and sequential mode
+    session = create_session(args.concurrent)
+
     # Check if server is reachable
     print("Checking server connectivity...")
     try:
-        response = requests.get(f"{args.url}/", timeout=5)
+        response = session.get(f"{args.url}/", timeout=5)
         print(f"Server is up! Status: {response.status_code}\n")
     except requests.exceptions.RequestException as e:
         print(f"Error: Cannot connect to server at {args.url}")
         print(f"Details: {e}")
+        session.close()
         return 1
 
     # Run the test
@@ -215,11 +342,13 @@ def main():
     start_time = time.time()
 
     if args.sequential:
-        results = run_sequential_test(args.url, all_queries)
+        results = run_sequential_test(session, args.url, all_queries)
     else:
-        results = run_concurrent_test(args.url, all_queries, args.concurrent)
+        coro = run_concurrent_test(args.url, all_queries, args.concurrent)
+        results = uvloop.run(coro) if uvloop is not None else asyncio.run(coro)
 
     total_time = time.time() - start_time
+    session.close()
 
     # Show verbose output if requested
     if args.verbose:
@@ -228,7 +357,8 @@ def main():
         print("-" * 60)
         for r in results:
             print(f"\nQuery: {r['query']}")
-            print(f"Status: {r['status_code']}, Time: {r['elapsed']:.2f}s")
+            ttft = f"{r['ttft']:.2f}s" if r['ttft'] is not None else "N/A"
+            print(f"Status: {r['status_code']}, Time: {r['elapsed']:.2f}s, TTFB: {ttft}")
             if r['response']:
                 print(f"Response: {r['response']}")
 
@@ -37,6 +37,7 @@ response = agent.create_turn(
     stream=True,
 )
 
-# Log the agent events
+# Log the agent events as they arrive
 for log in AgentEventLogger().log(response):
-    log.print() if hasattr(log, 'print') else print(log)
\ No newline at end of file
+    print(log, end="", flush=True)
+print()
@@ -1,7 +1,7 @@
 import os
 import logging
 from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient, Agent
+from llama_stack_client import LlamaStackClient, Agent, AgentEventLogger
 
 # Suppress httpx and llama_stack_client INFO logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -46,12 +46,10 @@ session_id = agent.create_session(session_name="finance_search_session")
 response = agent.create_turn(
     session_id=session_id,
     messages=[{"role": "user", "content": "get me the orders for AROUT"}],
-    stream=False,
+    stream=True,
 )
 
-# Print the response - extract text from the final message
-for output in response.output:
-    if hasattr(output, 'content'):
-        for content in output.content:
-            if hasattr(content, 'text'):
-                print(content.text)
+# Stream the response - print text as it arrives
+for log in AgentEventLogger().log(response):
+    print(log, end="", flush=True)
+print()
@@ -1,7 +1,7 @@
 import os
 import logging
 from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient, Agent
+from llama_stack_client import LlamaStackClient, Agent, AgentEventLogger
 
 # Suppress httpx and llama_stack_client INFO logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -52,12 +52,10 @@ session_id = agent.create_session(session_name="multi_turn_session")
 
 
 def print_response(response):
-    """Extract and print text from the response"""
-    for output in response.output:
-        if hasattr(output, 'content'):
-            for content in output.content:
-                if hasattr(content, 'text'):
-                    print(content.text)
+    """Stream and print text from the response as it arrives"""
+    for log in AgentEventLogger().log(response):
+        print(log, end="", flush=True)
+    print()
 
 
 # Turn 1: Ask who Thomas Hardy works for
@@ -68,7 +66,7 @@ print("=" * 60)
 response1 = agent.create_turn(
     session_id=session_id,
     messages=[{"role": "user", "content": "who does Thomas Hardy work for?"}],
-    stream=False,
+    stream=True,
 )
 print_response(response1)
 
@@ -81,6 +79,6 @@ print("=" * 60)
 response2 = agent.create_turn(
     session_id=session_id,
     messages=[{"role": "user", "content": "what are their orders?"}],
-    stream=False,
+    stream=True,
 )
 print_response(response2)
@@ -1,7 +1,8 @@
 import os
+import sys
 import logging
 from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient, Agent
+from llama_stack_client import LlamaStackClient, Agent, AgentEventLogger
 
 # Suppress httpx and llama_stack_client INFO logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -15,6 +16,7 @@ LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL", "http://localhost:8321"
 INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "vllm/qwen3-14b")
 CUSTOMER_MCP_SERVER_URL = os.getenv("CUSTOMER_MCP_SERVER_URL")
 FINANCE_MCP_SERVER_URL = os.getenv("FINANCE_MCP_SERVER_URL")
+_BANNER = "=" * 60
 
 print(f"Base URL:     {LLAMA_STACK_BASE_URL}")
 print(f"Model:        {INFERENCE_MODEL}")
@@ -52,40 +54,59 @@ session_id = agent.create_session(session_name="hitl_session")
 
 
 def print_response(response):
-    """Extract and print text from the response"""
-    for output in response.output:
-        if hasattr(output, 'content'):
-            for content in output.content:
-                if hasattr(content, 'text'):
-                    print(content.text)
+    """Stream and print text from the response as it arrives"""
+    for log in AgentEventLogger().log(response):
+        print(log, end="", flush=True)
+    print()
 
 
-print("=" * 60)
+EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+INTERACTIVE = sys.stdin.isatty()
+
+
+def read_prompt():
+    """Read the next prompt, from the terminal or line by line from piped stdin"""
+    if INTERACTIVE:
+        return input("You: ")
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    # Echo piped prompts so the transcript shows what was asked
+    sys.stdout.write(f"You: {line}")
+    return line
+
+
+print(_BANNER)
 print("Human-in-the-Loop Agent")
 print("Type 'exit' or 'quit' to end the conversation")
-print("=" * 60)
+print(_BANNER)
 print()
 
+# Reused for every turn: create_turn serializes the list into the request without
+# keeping it, and each streamed turn is fully consumed before the next prompt is read
+message_buffer = [{"role": "user", "content": ""}]
+
 # Interactive loop
 turn_count = 0
 while True:
     try:
-        user_input = input("You: ").strip()
+        user_input = read_prompt().strip()
 
         if not user_input:
             continue
 
-        if user_input.lower() in ['exit', 'quit', 'q']:
+        if user_input.lower() in EXIT_COMMANDS:
             print("\nGoodbye!")
             break
 
         turn_count += 1
         print(f"\n[Turn {turn_count}]")
 
+        message_buffer[0]["content"] = user_input
         response = agent.create_turn(
             session_id=session_id,
-            messages=[{"role": "user", "content": user_input}],
-            stream=False,
+            messages=message_buffer,
+            stream=True,
         )
 
         print("Agent: ", end="")
@@ -29,20 +29,35 @@ Architecture:
 """
 
 import os
-import json
+import time
+import hashlib
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import httpx
+from collections import OrderedDict
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient
 from mcp.server.fastmcp import FastMCP
 
-# Configure logging
+# Configure logging. The log file is written by a background listener thread, so a
+# tool call on the event loop only enqueues the record; the file rotates at 50 MB
+log_queue = queue.Queue(-1)
+log_file_listener = QueueListener(
+    log_queue,
+    RotatingFileHandler('mcp_server_llama_stack.log', maxBytes=50_000_000, backupCount=3)
+)
+log_file_listener.start()
+atexit.register(log_file_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('mcp_server_llama_stack.log')
+        QueueHandler(log_queue)
     ]
 )
 logger = logging.getLogger(__name__)
@@ -65,27 +80,74 @@ mcp = FastMCP("Customer Agent MCP Server", port=CUSTOMER_AGENT_PORT)
 
 # Log all environment variables used by this server
 LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
-INFERENCE_MODEL = os.getenv("INFERENCE_MODEL")
+INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "ollama/llama3.2:3b")
 MCP_CUSTOMER_SERVER_URL = os.getenv("MCP_CUSTOMER_SERVER_URL")
+_BANNER = "=" * 60
+
+# MCP tool definition passed to every responses.create call, built once
+_CUSTOMER_TOOLS = (
+    {
+        "type": "mcp",
+        "server_url": MCP_CUSTOMER_SERVER_URL,
+        "server_label": "customer",
+    },
+)
+
+# In-process response cache for repeated prompts
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = float(os.getenv("CUSTOMER_AGENT_CACHE_TTL", "300"))
+response_cache = OrderedDict()
+
+
+def _cache_key(tool_name: str, prompt: str) -> tuple:
+    """Build a cache key from the tool, model, MCP server and normalized prompt."""
+    prompt_hash = hashlib.blake2b(prompt.strip().lower().encode(), digest_size=16).hexdigest()
+    return (tool_name, INFERENCE_MODEL, MCP_CUSTOMER_SERVER_URL, prompt_hash)
 
 
-# Global Llama Stack client
+def _cache_get(key: tuple):
+    """Return the cached response for key, or None if missing or expired."""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at > RESPONSE_CACHE_TTL:
+        del response_cache[key]
+        return None
+    response_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value) -> None:
+    """Store a response, evicting the least recently used entry when full."""
+    response_cache[key] = (time.monotonic(), value)
+    response_cache.move_to_end(key)
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+
+# Global async Llama Stack client, shared by all concurrent tool calls
 llama_client = None
 
 
 def get_llama_client():
-    """Get or create Llama Stack client."""
+    """Get or create the async Llama Stack client."""
     global llama_client
     if llama_client is None:
-        LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
-        logger.info(f"Creating new Llama Stack client with base_url: {LLAMA_STACK_BASE_URL}")
-        llama_client = LlamaStackClient(base_url=LLAMA_STACK_BASE_URL)
+        logger.info(f"Creating new async Llama Stack client with base_url: {LLAMA_STACK_BASE_URL}")
+        # Pooled keep-alive connections so the TCP/TLS handshake is paid once, not per tool call
+        llama_client = AsyncLlamaStackClient(
+            base_url=LLAMA_STACK_BASE_URL,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            ),
+        )
         logger.info("Llama Stack client created successfully")
     return llama_client
 
 
 @mcp.tool()
-def customer_agent(prompt: str) -> str:
+async def customer_agent(prompt: str) -> str:
     """
     Execute the customer agent with the given prompt.
 
@@ -104,33 +166,30 @@ def customer_agent(prompt: str) -> str:
         - "Find customer with with contact email thomashardy@example.com"
     """
     logger.info(f"customer_agent called with prompt: {prompt[:100]}...")
+    key = _cache_key("customer_agent", prompt)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Returning cached customer_agent response")
+        return cached
+
     try:
         client = get_llama_client()
 
-
-        logger.info(f"INFERENCE_MODEL: {INFERENCE_MODEL}")
-        logger.info(f"MCP_CUSTOMER_SERVER_URL: {MCP_CUSTOMER_SERVER_URL}")
-
         if not MCP_CUSTOMER_SERVER_URL:
             logger.error("MCP_CUSTOMER_SERVER_URL not configured in environment")
             return "Error: MCP_CUSTOMER_SERVER_URL not configured in environment"
 
         # Use Llama Stack's Responses API with MCP tools
         logger.info("Creating Llama Stack Agent via responses.create...")
-        agent_responses = client.responses.create(
+        agent_responses = await client.responses.create(
             model=INFERENCE_MODEL,
             input=prompt,
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_url": MCP_CUSTOMER_SERVER_URL,
-                    "server_label": "customer",
-                }
-            ],
+            tools=_CUSTOMER_TOOLS,
         )
 
         # Return the final text response
         logger.info(f"Agent response received: {agent_responses.output_text[:100]}...")
+        _cache_put(key, agent_responses.output_text)
         return agent_responses.output_text
 
     except Exception as e:
@@ -138,8 +197,38 @@ def customer_agent(prompt: str) -> str:
         return f"Error executing customer agent: {str(e)}"
 
 
+def _trace_step(step: int, output) -> dict:
+    """Describe one Responses API output item as a trace entry."""
+    trace_item = {
+        "step": step,
+        "type": output.type
+    }
+
+    if output.type == "mcp_list_tools":
+        trace_item["server"] = output.server_label
+        trace_item["tools"] = [t.name for t in output.tools]
+        logger.debug(f"Step {step}: Listed {len(output.tools)} tools from {output.server_label}")
+
+    elif output.type == "mcp_call":
+        trace_item["tool_name"] = output.name
+        trace_item["arguments"] = output.arguments
+        if output.error:
+            trace_item["error"] = output.error
+            logger.warning(f"Step {step}: Tool call to {output.name} failed: {output.error}")
+        else:
+            logger.debug(f"Step {step}: Called tool {output.name}")
+
+    elif output.type == "message":
+        trace_item["role"] = output.role
+        if hasattr(output.content[0], 'text'):
+            trace_item["content"] = output.content[0].text
+        logger.debug(f"Step {step}: Message from {output.role}")
+
+    return trace_item
+
+
 @mcp.tool()
-def customer_agent_detailed(prompt: str) -> str:
+async def customer_agent_detailed(prompt: str) -> dict:
     """
     Execute the customer agent with detailed execution trace.
 
@@ -150,64 +239,34 @@ def customer_agent_detailed(prompt: str) -> str:
         prompt: The question or instruction for the customer agent
 
     Returns:
-        A detailed JSON string containing the execution trace and final response
+        A dict containing the execution trace and final response, which
+        FastMCP serializes once as structured tool output
     """
     logger.info(f"customer_agent_detailed called with prompt: {prompt[:100]}...")
+    key = _cache_key("customer_agent_detailed", prompt)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Returning cached customer_agent_detailed response")
+        return cached
+
     try:
         client = get_llama_client()
 
-
-        logger.info(f"Using inference model: {INFERENCE_MODEL}")
-        logger.info(f"MCP Customer Server URL: {MCP_CUSTOMER_SERVER_URL}")
-
         if not MCP_CUSTOMER_SERVER_URL:
             logger.error("MCP_CUSTOMER_SERVER_URL not configured in environment")
-            return json.dumps({"error": "MCP_CUSTOMER_SERVER_URL not configured"})
+            return {"error": "MCP_CUSTOMER_SERVER_URL not configured"}
 
         # Use Llama Stack's Responses API with MCP tools
         logger.info("Calling Llama Stack responses API with detailed trace...")
-        agent_responses = client.responses.create(
+        agent_responses = await client.responses.create(
             model=INFERENCE_MODEL,
             input=prompt,
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_url": MCP_CUSTOMER_SERVER_URL,
-                    "server_label": "customer",
-                }
-            ],
+            tools=_CUSTOMER_TOOLS,
         )
 
         # Build detailed trace
         logger.info("Building detailed execution trace...")
-        trace = []
-        for i, output in enumerate(agent_responses.output):
-            trace_item = {
-                "step": i + 1,
-                "type": output.type
-            }
-
-            if output.type == "mcp_list_tools":
-                trace_item["server"] = output.server_label
-                trace_item["tools"] = [t.name for t in output.tools]
-                logger.debug(f"Step {i+1}: Listed {len(output.tools)} tools from {output.server_label}")
-
-            elif output.type == "mcp_call":
-                trace_item["tool_name"] = output.name
-                trace_item["arguments"] = output.arguments
-                if output.error:
-                    trace_item["error"] = output.error
-                    logger.warning(f"Step {i+1}: Tool call to {output.name} failed: {output.error}")
-                else:
-                    logger.debug(f"Step {i+1}: Called tool {output.name}")
-
-            elif output.type == "message":
-                trace_item["role"] = output.role
-                if hasattr(output.content[0], 'text'):
-                    trace_item["content"] = output.content[0].text
-                logger.debug(f"Step {i+1}: Message from {output.role}")
-
-            trace.append(trace_item)
+        trace = [_trace_step(i, output) for i, output in enumerate(agent_responses.output, 1)]
 
         result = {
             "trace": trace,
@@ -215,11 +274,12 @@ def customer_agent_detailed(prompt: str) -> str:
         }
 
         logger.info(f"Detailed trace completed with {len(trace)} steps")
-        return json.dumps(result, indent=2)
+        _cache_put(key, result)
+        return result
 
     except Exception as e:
         logger.error(f"Error executing customer agent (detailed): {str(e)}", exc_info=True)
-        return json.dumps({"error": f"Error executing customer agent: {str(e)}"})
+        return {"error": f"Error executing customer agent: {str(e)}"}
 
 
 if __name__ == "__main__":
@@ -228,12 +288,12 @@ if __name__ == "__main__":
     logger.info("Starting MCP server with streamable-http transport...")
 
 
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     logger.info("Environment Configuration:")
     logger.info(f"  LLAMA_STACK_BASE_URL: {LLAMA_STACK_BASE_URL}")
     logger.info(f"  INFERENCE_MODEL: {INFERENCE_MODEL}")
     logger.info(f"  MCP_CUSTOMER_SERVER_URL: {MCP_CUSTOMER_SERVER_URL}")
     logger.info(f"  CUSTOMER_AGENT_PORT: {CUSTOMER_AGENT_PORT}")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
 
     mcp.run(transport="streamable-http")
@@ -12,7 +12,10 @@ sophisticated agent that can:
 import os
 import json
 import logging
+import itertools
 import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, TypedDict, Literal
 from dotenv import load_dotenv
 
@@ -36,15 +39,16 @@ load_dotenv()
 MCP_URL = os.getenv('CUSTOMER_AGENT_URL')
 MCP_SESSION_ID = None
 TEST_INFERENCE_MODEL = os.getenv("TEST_INFERENCE_MODEL")
+_BANNER = "=" * 80
 
 # Log environment variables at startup
-logger.info("="*80)
+logger.info(_BANNER)
 logger.info("Environment Variables at Startup:")
-logger.info("="*80)
+logger.info(_BANNER)
 logger.info(f"CUSTOMER_AGENT_URL: {os.getenv('CUSTOMER_AGENT_URL')}")
 logger.info(f"MCP_URL: {MCP_URL}")
 logger.info(f"TEST_INFERENCE_MODEL: {TEST_INFERENCE_MODEL}")
-logger.info("="*80)
+logger.info(_BANNER)
 
 
 
@@ -54,6 +58,13 @@ class MCPClient:
     def __init__(self, url: str):
         self.url = url
         self.session_id = None
+        # One HTTP session for the handshake and every tool call, so the
+        # connection to the MCP server is reused instead of reopened per call
+        self.http = requests.Session()
+        # JSON-RPC ids for tools/call; the server routes each response by id, so
+        # concurrent calls on one session must not share one (next() on a count
+        # is atomic, so tool_node's threads can draw from it safely)
+        self._ids = itertools.count(2)
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream"
@@ -73,7 +84,7 @@ class MCPClient:
             "id": 1
         }
 
-        response = requests.post(self.url, headers=self.headers, json=init_payload)
+        response = self.http.post(self.url, headers=self.headers, json=init_payload)
         self.session_id = response.headers.get('mcp-session-id')
 
         if self.session_id:
@@ -91,42 +102,55 @@ class MCPClient:
                 "name": tool_name,
                 "arguments": arguments
             },
-            "id": 3
+            "id": next(self._ids)
         }
 
         logger.info(f"📤 Sending MCP request to tool '{tool_name}'")
         logger.info(f"📤 MCP Payload: {json.dumps(call_payload, indent=2)}")
         logger.info(f"📤 Tool Arguments: {json.dumps(arguments, indent=2)}")
 
-        response = requests.post(self.url, headers=self.headers, json=call_payload)
+        # Parse the SSE response one line at a time as it arrives rather than
+        # buffering the whole body; the stream is still read to the end so the
+        # connection goes back to the session's pool
+        result_text = None
+        with self.http.post(self.url, headers=self.headers, json=call_payload, stream=True) as response:
+            logger.info(f"📥 Received MCP response (status: {response.status_code})")
 
-        logger.info(f"📥 Received MCP response (status: {response.status_code})")
-
-        # Parse SSE response
-        text = response.text
-        logger.info(f"📥 Raw response text (first 500 chars): {text[:500]}...")
-
-        lines = text.split('\n')
-        for line in lines:
-            if line.startswith('data: '):
+            for line in response.iter_lines():
+                if result_text is not None or not line.startswith(b'data: '):
+                    continue
                 data = json.loads(line[6:])
                 logger.info(f"📥 Parsed MCP data: {json.dumps(data, indent=2)}")
                 if 'result' in data:
                     if 'content' in data['result']:
                         result_text = data['result']['content'][0]['text']
                         logger.info(f"📥 Extracted result from 'content': {result_text[:200]}...")
-                        return result_text
                     elif 'structuredContent' in data['result']:
                         result_text = data['result']['structuredContent']['result']
                         logger.info(f"📥 Extracted result from 'structuredContent': {result_text[:200]}...")
-                        return result_text
+
+        if result_text is not None:
+            return result_text
 
         logger.error("❌ Error: Could not parse MCP response")
         return "Error: Could not parse MCP response"
 
 
-# Initialize MCP client
-mcp_client = MCPClient(MCP_URL)
+# MCP client, created on first tool call so importing this module (e.g. during
+# pytest collection) does not open a session against the MCP server
+mcp_client = None
+# tool_node runs tool calls on a thread pool, so the first calls can race to create it
+_mcp_client_lock = threading.Lock()
+
+
+def get_mcp_client():
+    """Get or create the MCP client."""
+    global mcp_client
+    if mcp_client is None:
+        with _mcp_client_lock:
+            if mcp_client is None:
+                mcp_client = MCPClient(MCP_URL)
+    return mcp_client
 
 
 # Create LangGraph tools that wrap MCP functionality
@@ -142,7 +166,7 @@ def search_customer(query: str) -> str:
         Customer information or search results
     """
     print(f"\n🔍 Calling MCP customer_agent with query: {query}")
-    result = mcp_client.call_tool("customer_agent", {"prompt": query})
+    result = get_mcp_client().call_tool("customer_agent", {"prompt": query})
     print(f"📥 MCP Response received\n")
     return result
 
@@ -159,7 +183,7 @@ def get_customer_detailed(query: str) -> str:
         Detailed customer information with trace
     """
     print(f"\n🔍 Calling MCP customer_agent_detailed with query: {query}")
-    result = mcp_client.call_tool("customer_agent_detailed", {"prompt": query})
+    result = get_mcp_client().call_tool("customer_agent_detailed", {"prompt": query})
     print(f"📥 MCP Detailed Response received\n")
     return result
 
@@ -168,6 +192,8 @@ def get_customer_detailed(query: str) -> str:
 class AgentState(TypedDict):
     """State for the customer service agent"""
     messages: Annotated[list[BaseMessage], add_messages]
+    # Successful tool results from this conversation, keyed by tool name and arguments
+    tool_cache: dict[str, str]
 
 
 # Initialize the LLM
@@ -186,25 +212,29 @@ def agent_node(state: AgentState) -> AgentState:
     """The main agent that decides what to do"""
     print("\n🤖 Agent thinking...")
 
-    # Log the messages being sent to the LLM
-    logger.info("=" * 80)
-    logger.info("📤 SENDING TO LLM - Full conversation context:")
-    logger.info("=" * 80)
-    for i, msg in enumerate(state["messages"], 1):
-        msg_type = type(msg).__name__
-        logger.info(f"\nMessage {i} ({msg_type}):")
-        logger.info(f"  Content: {msg.content}")
-        if hasattr(msg, 'tool_calls') and msg.tool_calls:
-            logger.info(f"  Tool Calls: {msg.tool_calls}")
-        if hasattr(msg, 'tool_call_id'):
-            logger.info(f"  Tool Call ID: {msg.tool_call_id}")
-    logger.info("=" * 80)
+    # Log the messages being sent to the LLM; the whole conversation is walked,
+    # so skip it entirely when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(_BANNER)
+        logger.info("📤 SENDING TO LLM - Full conversation context:")
+        logger.info(_BANNER)
+        for i, msg in enumerate(state["messages"], 1):
+            msg_type = type(msg).__name__
+            logger.info(f"\nMessage {i} ({msg_type}):")
+            logger.info(f"  Content: {msg.content}")
+            tool_calls = getattr(msg, 'tool_calls', None)
+            if tool_calls:
+                logger.info(f"  Tool Calls: {tool_calls}")
+            tool_call_id = getattr(msg, 'tool_call_id', None)
+            if tool_call_id is not None:
+                logger.info(f"  Tool Call ID: {tool_call_id}")
+        logger.info(_BANNER)
 
     response = llm_with_tools.invoke(state["messages"])
 
     logger.info("\n📥 LLM Response:")
     logger.info(f"  Content: {response.content}")
-    if hasattr(response, 'tool_calls') and response.tool_calls:
+    if response.tool_calls:
         logger.info(f"  Tool Calls Requested: {response.tool_calls}")
 
     return {"messages": [response]}
@@ -222,8 +252,11 @@ def tool_node(state: AgentState) -> AgentState:
 
     logger.info(f"\n🔧 Executing {len(tool_calls)} tool call(s)")
 
-    tool_messages = []
-    for i, tool_call in enumerate(tool_calls, 1):
+    tool_cache = state.get("tool_cache", {})
+    new_results = {}
+
+    def run_tool_call(numbered_call):
+        i, tool_call = numbered_call
         tool_name = tool_call["name"]
         tool_args = tool_call["args"]
 
@@ -231,24 +264,34 @@ def tool_node(state: AgentState) -> AgentState:
         logger.info(f"  Name: {tool_name}")
         logger.info(f"  Arguments: {json.dumps(tool_args, indent=4)}")
 
-        # Execute the tool
-        if tool_name == "search_customer":
+        # Execute the tool, unless the same call already succeeded in this conversation
+        cache_key = json.dumps([tool_name, tool_args], sort_keys=True)
+        if cache_key in tool_cache:
+            result = tool_cache[cache_key]
+            logger.info("  ♻️ Reusing result of an identical earlier call")
+        elif tool_name == "search_customer":
             result = search_customer.invoke(tool_args)
         elif tool_name == "get_customer_detailed":
             result = get_customer_detailed.invoke(tool_args)
         else:
             result = f"Unknown tool: {tool_name}"
 
-        logger.info(f"  ✅ Tool Result (first 200 chars): {str(result)[:200]}...")
+        result = str(result)
+        logger.info(f"  ✅ Tool Result (first 200 chars): {result[:200]}...")
+        if not result.startswith(("Error", "Unknown tool")):
+            new_results[cache_key] = result
 
         # Create tool message
-        tool_message = ToolMessage(
-            content=str(result),
+        return ToolMessage(
+            content=result,
             tool_call_id=tool_call["id"]
         )
-        tool_messages.append(tool_message)
 
-    return {"messages": tool_messages}
+    # Tool calls are independent, so run them concurrently; map keeps the original order
+    with ThreadPoolExecutor(max_workers=len(tool_calls)) as executor:
+        tool_messages = list(executor.map(run_tool_call, enumerate(tool_calls, 1)))
+
+    return {"messages": tool_messages, "tool_cache": {**tool_cache, **new_results}}
 
 
 # Define routing logic
@@ -257,7 +300,7 @@ def should_continue(state: AgentState) -> Literal["tools", "end"]:
     messages = state["messages"]
     last_message = messages[-1]
 
-    if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
+    if getattr(last_message, 'tool_calls', None):
         return "tools"
     return "end"
 
@@ -288,16 +331,16 @@ def create_agent_graph():
 
 def run_conversation(agent_graph, queries: list[str]):
     """Run a conversation with the agent"""
-    print("\n" + "="*80)
+    print("\n" + _BANNER)
     print("🚀 Starting LangGraph Customer Service Agent")
-    print("="*80)
+    print(_BANNER)
 
     state = {"messages": []}
 
     for i, query in enumerate(queries, 1):
-        print(f"\n{'='*80}")
+        print(f"\n{_BANNER}")
         print(f"📝 Query {i}: {query}")
-        print("="*80)
+        print(_BANNER)
 
         # Add human message
         state["messages"].append(HumanMessage(content=query))
@@ -329,9 +372,9 @@ def main():
     # Run the conversation
     run_conversation(agent_graph, queries)
 
-    print("\n" + "="*80)
+    print("\n" + _BANNER)
     print("✨ Conversation Complete!")
-    print("="*80)
+    print(_BANNER)
 
 
 if __name__ == "__main__":
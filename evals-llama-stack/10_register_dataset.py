@@ -5,24 +5,13 @@ Supports CLI arguments with fallback to environment variables.
 """
 
 import argparse
-import logging
 import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 
 def parse_args():
@@ -55,19 +44,19 @@ def parse_args():
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
     args = parse_args()
 
     # Resolve base_url: CLI > env var
-    base_url = args.base_url or os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = args.base_url or cfg["base_url"]
     if not base_url:
         logger.error("Base URL not provided. Use --base-url or set LLAMA_STACK_BASE_URL")
         sys.exit(1)
 
     # Resolve dataset_uri: CLI > env var
-    dataset_uri = args.dataset_uri or os.getenv("LLAMA_STACK_DATASET_URI")
+    dataset_uri = args.dataset_uri or cfg["dataset_uri"]
     if not dataset_uri:
         logger.error("Dataset URI not provided. Use --dataset-uri or set LLAMA_STACK_DATASET_URI")
         sys.exit(1)
@@ -81,7 +70,7 @@ def main():
         dataset_id = os.path.splitext(filename)[0]
 
     # Resolve provider_id: CLI > env var > default
-    provider_id = args.provider_id or os.getenv("LLAMA_STACK_DATASET_PROVIDER_ID", "localfs")
+    provider_id = args.provider_id or cfg["dataset_provider_id"] or "localfs"
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
     logger.info(f"Registering dataset: {dataset_id}")
@@ -89,8 +78,19 @@ def main():
     logger.info(f"Using dataset provider: {provider_id}")
     logger.info(f"Purpose: {args.purpose}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import BadRequestError
+    from _client import find_dataset, get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
+
+    # Re-runs are common while iterating; skip the register call if this exact
+    # dataset is already there, but re-register if the URI has changed
+    existing = find_dataset(client, dataset_id)
+    if existing is not None and getattr(existing.source, "uri", None) == dataset_uri:
+        logger.info(f"Dataset already registered: {dataset_id}")
+        return
 
     try:
         dataset = client.datasets.register(
@@ -102,6 +102,12 @@ def main():
             dataset_id=dataset_id,
             extra_body={"provider_id": provider_id},
         )
+    except BadRequestError as exc:
+        if "already exists" in str(exc):
+            logger.info(f"Dataset '{dataset_id}' already exists, skipping registration")
+            return
+        logger.error(f"Failed to register dataset: {exc}")
+        sys.exit(1)
     except Exception as exc:
         logger.error(f"Failed to register dataset: {exc}")
         sys.exit(1)
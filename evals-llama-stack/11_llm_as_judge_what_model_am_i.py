@@ -4,35 +4,22 @@ Register a scoring function and benchmark using an LLM as a judge
 for the "what model are you" evaluation dataset.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
-from llama_stack_client import BadRequestError
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
     DATASET_ID = "what-model-are-you-eval"
     SCORING_FN_ID = "what-model-scoring-fn"
     BENCHMARK_ID = "what-model-benchmark"
-    LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL", "http://localhost:8321")
-    JUDGE_MODEL = os.getenv("JUDGE_MODEL")
-    CANDIDATE_MODEL = os.getenv("CANDIDATE_MODEL")
+    LLAMA_STACK_BASE_URL = cfg["base_url"] or "http://localhost:8321"
+    JUDGE_MODEL = cfg["judge_model"]
+    CANDIDATE_MODEL = cfg["candidate_model"]
 
     if not JUDGE_MODEL:
         logger.error("JUDGE_MODEL environment variable is not set")
@@ -64,8 +51,12 @@ Provide a score from 1-5 and explain your reasoning."""
     logger.info(f"Using judge model: {JUDGE_MODEL}")
     logger.info(f"Using candidate model: {CANDIDATE_MODEL}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import BadRequestError
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=LLAMA_STACK_BASE_URL)
+    client = get_client(LLAMA_STACK_BASE_URL)
 
     try:
         client.scoring_functions.register(
@@ -3,39 +3,33 @@
 List eval/benchmark providers from a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
+logger = setup_logging()
 
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+# Eval-related provider APIs, in display order
+PROVIDER_APIS = (("datasetio", "Dataset"), ("eval", "Eval"), ("scoring", "Scoring"))
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
 
     # List all available providers
     logger.info("Fetching available providers...")
@@ -45,40 +39,24 @@ def main():
         logger.warning("No providers found")
         return
 
-    eval_providers = [p for p in providers if p.api == "eval"]
-    dataset_providers = [p for p in providers if p.api == "datasetio"]
-    scoring_providers = [p for p in providers if p.api == "scoring"]
-
-    
-    if dataset_providers:
-      logger.info(f"Found {len(dataset_providers)} Dataset provider(s):\n")
-      for p in dataset_providers:
-          print(f"  Provider ID: {p.provider_id}")
-          print(f"    Type: {p.provider_type}")
-          print(f"    API: {p.api}")
-          print()
-    else:
-      logger.warning("No dataset providers found (api=datasetio)")
-
-    if eval_providers:
-        logger.info(f"Found {len(eval_providers)} Eval provider(s):\n")
-        for p in eval_providers:
-            print(f"  Provider ID: {p.provider_id}")
-            print(f"    Type: {p.provider_type}")
-            print(f"    API: {p.api}")
-            print()
-    else:
-        logger.warning("No eval providers found (api=eval)")
-
-    if scoring_providers:
-        logger.info(f"Found {len(scoring_providers)} Scoring provider(s):\n")
-        for p in scoring_providers:
+    # The providers endpoint takes no filter or cursor, so walk the list once and
+    # keep only the eval-related providers, grouped by API
+    by_api = {api: [] for api, _ in PROVIDER_APIS}
+    for p in providers:
+        if p.api in by_api:
+            by_api[p.api].append(p)
+
+    for api, label in PROVIDER_APIS:
+        matching = by_api[api]
+        if not matching:
+            logger.warning(f"No {label.lower()} providers found (api={api})")
+            continue
+        logger.info(f"Found {len(matching)} {label} provider(s):\n")
+        for p in matching:
             print(f"  Provider ID: {p.provider_id}")
             print(f"    Type: {p.provider_type}")
             print(f"    API: {p.api}")
             print()
-    else:
-        logger.warning("No scoring providers found (api=scoring)")
 
 
 if __name__ == "__main__":
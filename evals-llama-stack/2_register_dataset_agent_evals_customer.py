@@ -3,24 +3,12 @@
 Register datasets/agent-evals-customer.csv with a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 DATASET_ID = "agent-evals-customer"
 DEFAULT_DATASET_URI = (
@@ -30,24 +18,35 @@ DEFAULT_DATASET_URI = (
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
-    dataset_uri = os.getenv("AGENT_EVALS_CUSTOMER_DATASET_URI", DEFAULT_DATASET_URI)
+    dataset_uri = cfg["agent_evals_customer_dataset_uri"] or DEFAULT_DATASET_URI
 
-    provider_id = os.getenv("LLAMA_STACK_DATASET_PROVIDER_ID", "localfs")
+    provider_id = cfg["dataset_provider_id"] or "localfs"
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
     logger.info(f"Registering dataset: {DATASET_ID}")
     logger.info(f"Using dataset provider: {provider_id}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import BadRequestError
+    from _client import find_dataset, get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
+
+    # Re-runs are common while iterating; skip the register call if this exact
+    # dataset is already there, but re-register if the URI has changed
+    existing = find_dataset(client, DATASET_ID)
+    if existing is not None and getattr(existing.source, "uri", None) == dataset_uri:
+        logger.info(f"Dataset already registered: {DATASET_ID}")
+        return
 
     try:
         dataset = client.datasets.register(
@@ -59,6 +58,12 @@ def main():
             dataset_id=DATASET_ID,
             extra_body={"provider_id": provider_id},
         )
+    except BadRequestError as exc:
+        if "already exists" in str(exc):
+            logger.info(f"Dataset '{DATASET_ID}' already exists, skipping registration")
+            return
+        logger.error(f"Failed to register dataset: {exc}")
+        sys.exit(1)
     except Exception as exc:
         logger.error(f"Failed to register dataset: {exc}")
         sys.exit(1)
@@ -3,33 +3,21 @@
 Unregister the agent-evals-customer dataset from a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 DATASET_ID = "agent-evals-customer"
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
@@ -37,8 +25,11 @@ def main():
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
     logger.info(f"Unregistering dataset: {DATASET_ID}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
 
     try:
         client.datasets.unregister(DATASET_ID)
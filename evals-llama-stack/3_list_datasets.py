@@ -3,50 +3,41 @@
 List all available datasets from a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
 
     # List all available datasets
     logger.info("Fetching available datasets...")
     datasets = client.datasets.list()
 
-    if not datasets:
-        logger.warning("No datasets found")
-        return
-
-    logger.info(f"Found {len(datasets)} dataset(s):\n")
-
+    # The datasets endpoint has no pagination cursor, so print each entry as we
+    # walk the response and report the count afterwards
+    count = 0
     for dataset in datasets:
+        if count == 0:
+            logger.info("Datasets:\n")
+        count += 1
         print(f"  Dataset ID: {dataset.identifier}")
         if hasattr(dataset, 'provider_id') and dataset.provider_id:
             print(f"    Provider: {dataset.provider_id}")
@@ -58,5 +49,11 @@ def main():
                 print(f"    Description: {description}")
         print()
 
+    if count == 0:
+        logger.warning("No datasets found")
+        return
+
+    logger.info(f"Found {count} dataset(s)")
+
 if __name__ == "__main__":
     main()
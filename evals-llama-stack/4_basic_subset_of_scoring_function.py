@@ -1,33 +1,52 @@
-import logging
-import os
 import sys
+from itertools import islice
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
+logger = setup_logging()
 
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
 
+# Load environment variables from .env file (cached per process)
+cfg = load_config()
 
-# Load environment variables from .env file
-load_dotenv()
-
-base_url = os.getenv("LLAMA_STACK_BASE_URL")
+base_url = cfg["base_url"]
 if not base_url:
     logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
     sys.exit(1)
 
+SCORING_FUNCTIONS = {"basic::subset_of": None}
+BATCH_SIZE = 64
+
+
+def score_rows(client, rows, batch_size=BATCH_SIZE):
+    """Score rows with one scoring.score request per batch_size rows.
+
+    Accumulate rows and pass them together rather than scoring one row per call.
+    Returns {scoring_fn: {"num_correct", "num_total", "score_rows"}} merged across batches.
+    """
+    merged = {}
+    rows = iter(rows)
+    while chunk := list(islice(rows, batch_size)):
+        result = client.scoring.score(
+            input_rows=chunk,
+            scoring_functions=SCORING_FUNCTIONS
+        )
+        for func_name, scoring_result in result.results.items():
+            entry = merged.setdefault(func_name, {"num_correct": 0, "num_total": 0, "score_rows": []})
+            entry["score_rows"].extend(scoring_result.score_rows)
+            accuracy = (scoring_result.aggregated_results or {}).get("accuracy")
+            if accuracy:
+                entry["num_correct"] += int(accuracy["num_correct"])
+                entry["num_total"] += int(accuracy["num_total"])
+    return merged
+
+
 # 1. Connect
-client = LlamaStackClient(base_url=base_url)
+# Imported only once the settings check out; loading the SDK dominates startup
+from _client import get_client
+
+client = get_client(base_url)
 
 # 2. Data
 eval_rows = [
@@ -39,24 +58,20 @@ eval_rows = [
 ]
 
 # 3. Score
-result = client.scoring.score(
-    input_rows=eval_rows,
-    scoring_functions={"basic::subset_of": None}
-)
+results = score_rows(client, eval_rows)
 
 # Pretty print the results
-for func_name, scoring_result in result.results.items():
+for func_name, scoring_result in results.items():
     print(f"\n=== {func_name} ===")
 
-    # Aggregated results
-    agg = scoring_result.aggregated_results
-    if agg:
-        print(f"Accuracy: {agg['accuracy']['accuracy']:.1%}")
-        print(f"Correct: {int(agg['accuracy']['num_correct'])} / {agg['accuracy']['num_total']}")
+    # Aggregated results, summed across batches
+    if scoring_result["num_total"]:
+        print(f"Accuracy: {scoring_result['num_correct'] / scoring_result['num_total']:.1%}")
+        print(f"Correct: {scoring_result['num_correct']} / {scoring_result['num_total']}")
 
     # Individual scores
     print("\nRow scores:")
-    for i, row in enumerate(scoring_result.score_rows):
+    for i, row in enumerate(scoring_result["score_rows"]):
         score = row['score']
         status = "✓" if score == 1.0 else "✗"
         print(f"  Row {i+1}: {status} (score: {score})")
\ No newline at end of file
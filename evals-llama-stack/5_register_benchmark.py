@@ -3,41 +3,33 @@
 Register a benchmark with a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient, NotFoundError
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import NotFoundError
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
 
-    provider_id = os.getenv("LLAMA_STACK_BENCHMARK_PROVIDER_ID")
+    provider_id = cfg["benchmark_provider_id"]
     if provider_id:
         logger.info(f"Using benchmark provider: {provider_id}")
 
@@ -3,52 +3,43 @@
 Unregister a benchmark from a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient, NoneType
-from llama_stack_client._models import FinalRequestOptions
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
-    benchmark_id = os.getenv("LLAMA_STACK_BENCHMARK_ID", "my-basic-quality-benchmark")
+    benchmark_id = cfg["benchmark_id"] or "my-basic-quality-benchmark"
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
     logger.info(f"Unregistering benchmark: {benchmark_id}")
 
-    # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import NoneType
+    from _client import get_client
 
-    opts = FinalRequestOptions.construct(
-        method="delete",
-        url=f"/v1alpha/eval/benchmarks/{benchmark_id}",
-        headers={"Accept": "*/*"},
-    )
+    # Create the Llama Stack client
+    client = get_client(base_url)
 
+    # This SDK version has no typed benchmarks.unregister(); use the client's public
+    # delete(), which is what typed methods such as datasets.unregister() call
     try:
-        client.request(NoneType, opts)
+        client.delete(
+            f"/v1alpha/eval/benchmarks/{benchmark_id}",
+            cast_to=NoneType,
+            options={"headers": {"Accept": "*/*"}},
+        )
     except Exception as exc:
         logger.error(f"Failed to unregister benchmark: {exc}")
         sys.exit(1)
@@ -3,48 +3,39 @@
 Run an eval job on a benchmark with a Llama Stack server.
 """
 
-import logging
-import os
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+logger = setup_logging()
 
 
 def main():
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
-    model_id = os.getenv("CANDIDATE_MODEL")
+    model_id = cfg["candidate_model"]
     if not model_id:
         logger.error("CANDIDATE_MODEL environment variable is not set")
         sys.exit(1)
 
-    benchmark_id = os.getenv("LLAMA_STACK_BENCHMARK_ID", "my-basic-quality-benchmark")
+    benchmark_id = cfg["benchmark_id"] or "my-basic-quality-benchmark"
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")    
     logger.info(f"Running eval for benchmark: {benchmark_id}")
     logger.info(f"Using candidate model: {model_id}")
 
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from _client import get_client
+
     # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    client = get_client(base_url)
 
     benchmark_config = {
         "eval_candidate": {
@@ -75,6 +66,7 @@ def main():
     job_id = getattr(job, "job_id", None)
     if job_id:
         logger.info(f"Eval job started: {job_id}")
+        logger.info(f"Review results with: python 8_review_eval_job.py {job_id}")
     else:
         logger.info("Eval job started")
 
@@ -1,54 +1,64 @@
 #!/usr/bin/env python3
 """
-Fetch an eval job result from a Llama Stack server and print scores.
+Wait for an eval job on a Llama Stack server to finish and print scores.
+The job ID can be passed as an argument (as printed by 7_execute_eval.py)
+or set with LLAMA_STACK_JOB_ID.
 """
 
-import logging
-import os
+import argparse
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
+from _bootstrap import run
+from _config import load_config
+from _log import setup_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
+logger = setup_logging()
 
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
 
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Wait for an eval job to finish and print its scores"
+    )
+    parser.add_argument(
+        "job_id",
+        nargs="?",
+        help="Eval job ID (default: LLAMA_STACK_JOB_ID env var)"
+    )
+    return parser.parse_args()
 
-def main():
-    # Load environment variables from .env file
-    load_dotenv()
 
-    base_url = os.getenv("LLAMA_STACK_BASE_URL")
+async def main():
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
+
+    args = parse_args()
+
+    base_url = cfg["base_url"]
     if not base_url:
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
-    benchmark_id = os.getenv("LLAMA_STACK_BENCHMARK_ID", "my-basic-quality-benchmark")
-    job_id = os.getenv("LLAMA_STACK_JOB_ID")
+    benchmark_id = cfg["benchmark_id"] or "my-basic-quality-benchmark"
+    job_id = args.job_id or cfg["job_id"]
     if not job_id:
-        logger.error("LLAMA_STACK_JOB_ID environment variable is not set")
+        logger.error("Job ID not provided. Pass it as an argument or set LLAMA_STACK_JOB_ID")
         sys.exit(1)
 
     logger.info(f"Connecting to Llama Stack server at: {base_url}")
-    logger.info(f"Fetching eval job result: benchmark={benchmark_id} job_id={job_id}")
+    logger.info(f"Waiting for eval job result: benchmark={benchmark_id} job_id={job_id}")
 
-    # Create the Llama Stack client
-    client = LlamaStackClient(base_url=base_url)
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from _client import get_async_client, wait_for_job
 
-    try:
-        result = client.alpha.eval.jobs.retrieve(job_id, benchmark_id=benchmark_id)
-    except Exception as exc:
-        logger.error(f"Failed to fetch eval job result: {exc}")
-        sys.exit(1)
+    # Create the Llama Stack client, scoped so its connection pool closes with the loop
+    async with get_async_client(base_url) as client:
+        try:
+            result = await wait_for_job(client, benchmark_id, job_id)
+        except Exception as exc:
+            logger.error(f"Failed to fetch eval job result: {exc}")
+            sys.exit(1)
+
+    # Formatting runs after the client is closed; nothing below touches the network
 
     if not result:
         logger.warning("No result returned for this job")
@@ -79,4 +89,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run(main())
@@ -3,35 +3,36 @@
 Register a scoring function and benchmark using an LLM as a judge.
 """
 
-import logging
-import os
+import asyncio
 import sys
 
-from dotenv import load_dotenv
-from llama_stack_client import LlamaStackClient
-from llama_stack_client import BadRequestError
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    force=True
-)
-logger = logging.getLogger(__name__)
-
-# Suppress httpx INFO logs
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
-
-def main():
-    # Load environment variables from .env file
-    load_dotenv()
+from _bootstrap import run
+from _config import load_config
+from _log import setup_logging
+
+logger = setup_logging()
+
+# Judge prompt template, sent as-is; the llm-as-judge provider fills it per row
+# with str.format, so it must keep {}-style placeholders.
+# Required variables: {input_query}, {expected_answer}, {generated_answer}
+JUDGE_PROMPT = """Please evaluate the following response for quality and accuracy.
+
+Question: {input_query}
+Expected Answer: {expected_answer}
+Generated Answer: {generated_answer}
+
+Provide a score from 1-5 and explain your reasoning."""
+
+
+async def main():
+    # Load environment variables from .env file (cached per process)
+    cfg = load_config()
     DATASET_ID = "basic-subset-of-evals"
     SCORING_FN_ID = "my-llm-as-judge-scoring-fn"
     BENCHMARK_ID = "my-llm-as-judge-benchmark"
-    LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL", "http://localhost:8321")
-    JUDGE_MODEL = os.getenv("JUDGE_MODEL")
-    CANDIDATE_MODEL = os.getenv("CANDIDATE_MODEL")
+    LLAMA_STACK_BASE_URL = cfg["base_url"] or "http://localhost:8321"
+    JUDGE_MODEL = cfg["judge_model"]
+    CANDIDATE_MODEL = cfg["candidate_model"]
 
     if not JUDGE_MODEL:
         logger.error("JUDGE_MODEL environment variable is not set")
@@ -43,75 +44,73 @@ def main():
         logger.error("LLAMA_STACK_BASE_URL environment variable is not set")
         sys.exit(1)
 
-
-    # Define the judge prompt template
-    # Required variables: {input_query}, {expected_answer}, {generated_answer}
-    judge_prompt = """Please evaluate the following response for quality and accuracy.
-
-Question: {input_query}
-Expected Answer: {expected_answer}
-Generated Answer: {generated_answer}
-
-Provide a score from 1-5 and explain your reasoning."""
-
     logger.info(f"Connecting to Llama Stack server at: {LLAMA_STACK_BASE_URL}")
     logger.info(f"Registering scoring function: {SCORING_FN_ID}")
     logger.info(f"Using judge model: {JUDGE_MODEL}")
     logger.info(f"Using candidate model: {CANDIDATE_MODEL}")
 
-    # Create the Llama Stack client
-    client = LlamaStackClient(base_url=LLAMA_STACK_BASE_URL)
-
-    try:
-        client.scoring_functions.register(
-            scoring_fn_id=SCORING_FN_ID,
-            description="LLM-as-judge scoring function for evaluating response quality",
-            return_type={"type": "string"},
-            provider_id="llm-as-judge",
-            provider_scoring_fn_id="llm-as-judge-base",
-            params={
-                "type": "llm_as_judge",
-                "judge_model": JUDGE_MODEL,
-                "prompt_template": judge_prompt,
-            },
-        )
-        logger.info(f"Scoring function '{SCORING_FN_ID}' registered successfully")
-    except BadRequestError as e:
-        if "already exists" in str(e):
-            logger.info(f"Scoring function '{SCORING_FN_ID}' already exists, skipping registration")
-        else:
-            raise
+    # Imported only once the settings check out; loading the SDK dominates startup
+    from llama_stack_client import BadRequestError
+    from _client import get_async_client, wait_for_job
 
-    try:
-        client.benchmarks.register(
+    # Create the Llama Stack client
+    async with get_async_client(LLAMA_STACK_BASE_URL) as client:
+
+        async def register_scoring_fn():
+            try:
+                await client.scoring_functions.register(
+                    scoring_fn_id=SCORING_FN_ID,
+                    description="LLM-as-judge scoring function for evaluating response quality",
+                    return_type={"type": "string"},
+                    provider_id="llm-as-judge",
+                    provider_scoring_fn_id="llm-as-judge-base",
+                    params={
+                        "type": "llm_as_judge",
+                        "judge_model": JUDGE_MODEL,
+                        "prompt_template": JUDGE_PROMPT,
+                    },
+                )
+                logger.info(f"Scoring function '{SCORING_FN_ID}' registered successfully")
+            except BadRequestError as e:
+                if "already exists" in str(e):
+                    logger.info(f"Scoring function '{SCORING_FN_ID}' already exists, skipping registration")
+                else:
+                    raise
+
+        async def register_benchmark():
+            try:
+                await client.benchmarks.register(
+                    benchmark_id=BENCHMARK_ID,
+                    dataset_id=DATASET_ID,
+                    scoring_functions=[SCORING_FN_ID],
+                    provider_id="meta-reference",
+                )
+                logger.info(f"Benchmark '{BENCHMARK_ID}' registered successfully")
+            except BadRequestError as e:
+                if "already exists" in str(e):
+                    logger.info(f"Benchmark '{BENCHMARK_ID}' already exists, skipping registration")
+                else:
+                    raise
+
+        # The benchmark only stores the scoring function ID, so both registrations can run at once
+        await asyncio.gather(register_scoring_fn(), register_benchmark())
+
+        job = await client.alpha.eval.run_eval(
             benchmark_id=BENCHMARK_ID,
-            dataset_id=DATASET_ID,
-            scoring_functions=[SCORING_FN_ID],
-            provider_id="meta-reference",
-        )
-        logger.info(f"Benchmark '{BENCHMARK_ID}' registered successfully")
-    except BadRequestError as e:
-        if "already exists" in str(e):
-            logger.info(f"Benchmark '{BENCHMARK_ID}' already exists, skipping registration")
-        else:
-            raise
-
-    job = client.alpha.eval.run_eval(
-        benchmark_id=BENCHMARK_ID,
-        benchmark_config={
-            "eval_candidate": {
-                "type": "model",
-                "model": CANDIDATE_MODEL,
-                "sampling_params": {
-                    "max_tokens": 1024,
+            benchmark_config={
+                "eval_candidate": {
+                    "type": "model",
+                    "model": CANDIDATE_MODEL,
+                    "sampling_params": {
+                        "max_tokens": 1024,
+                    },
                 },
+                "scoring_params": {},
             },
-            "scoring_params": {},
-        },
-    )
-    logger.info(f"Eval job started: {job.job_id}")
-    
-    result = client.alpha.eval.jobs.retrieve(job_id=job.job_id, benchmark_id=BENCHMARK_ID)
+        )
+        logger.info(f"Eval job started: {job.job_id}")
+
+        result = await wait_for_job(client, BENCHMARK_ID, job.job_id)
 
     # Format and display results
     print("\n" + "=" * 80)
@@ -144,4 +143,4 @@ Provide a score from 1-5 and explain your reasoning."""
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Event loop entry point for the async eval scripts.
+
+run() uses uvloop when it is installed (pip install uvloop) for cheaper
+socket I/O on large asyncio.gather batches, and plain asyncio otherwise.
+"""
+
+import asyncio
+
+
+def run(main):
+    """Run the main() coroutine to completion on the fastest available loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -0,0 +1,107 @@
+"""
+Shared Llama Stack client factory for the eval scripts.
+
+Scripts get their client from here instead of constructing LlamaStackClient
+directly, so every call goes through one pooled httpx connection and pays the
+TCP/TLS handshake once per process.
+"""
+
+import asyncio
+import atexit
+
+import httpx
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+# The SDK retries connection errors, 408/409/429 and 5xx with jittered exponential
+# backoff; allow more attempts than its default of 2 so a transient blip mid-run
+# doesn't force re-running the whole script
+MAX_RETRIES = 4
+
+# Multiplex gathered async requests over one connection when h2 is installed
+# (pip install "httpx[http2]"); otherwise stay on HTTP/1.1 keep-alive.
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_clients = {}
+
+
+def _use_orjson(response: httpx.Response) -> None:
+    """Decode this response's JSON body with orjson; the SDK parses via response.json()."""
+    response.json = lambda **kwargs: orjson.loads(response.content)
+
+
+async def _use_orjson_async(response: httpx.Response) -> None:
+    _use_orjson(response)
+
+
+# Large payloads (score_rows, generations) decode faster with orjson when it is installed
+SYNC_EVENT_HOOKS = {"response": [_use_orjson]} if orjson else {}
+ASYNC_EVENT_HOOKS = {"response": [_use_orjson_async]} if orjson else {}
+
+
+def _warm_up(http_client: httpx.Client, base_url: str) -> None:
+    """Open the keep-alive connection with a cheap health check, ignoring failures."""
+    try:
+        http_client.get(f"{base_url.rstrip('/')}/v1/health", timeout=5.0)
+    except httpx.HTTPError:
+        pass
+
+
+def get_client(base_url: str) -> LlamaStackClient:
+    """Return the shared LlamaStackClient for base_url, creating it on first use."""
+    client = _clients.get(base_url)
+    if client is None:
+        http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT,
+                                   event_hooks=SYNC_EVENT_HOOKS)
+        # Pay the TCP/TLS handshake here so the script's first real call reuses the socket
+        _warm_up(http_client, base_url)
+        client = LlamaStackClient(base_url=base_url, http_client=http_client, max_retries=MAX_RETRIES)
+        atexit.register(client.close)
+        _clients[base_url] = client
+    return client
+
+
+def get_async_client(base_url: str) -> AsyncLlamaStackClient:
+    """Create an AsyncLlamaStackClient with the same pool settings.
+
+    Use it as ``async with get_async_client(base_url) as client:`` so the
+    pool is closed inside the event loop that opened it.
+    """
+    return AsyncLlamaStackClient(
+        base_url=base_url,
+        http_client=httpx.AsyncClient(http2=HTTP2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT,
+                                      event_hooks=ASYNC_EVENT_HOOKS),
+        max_retries=MAX_RETRIES,
+    )
+
+
+def find_dataset(client: LlamaStackClient, dataset_id: str):
+    """Return the registered dataset with this identifier, or None."""
+    return next((d for d in client.datasets.list() if d.identifier == dataset_id), None)
+
+
+async def wait_for_job(client: AsyncLlamaStackClient, benchmark_id: str, job_id: str,
+                       initial: float = 1.0, cap: float = 30.0):
+    """Poll an eval job with exponential backoff and return its result once completed.
+
+    Raises RuntimeError if the job fails or is cancelled.
+    """
+    delay = initial
+    while True:
+        job = await client.alpha.eval.jobs.status(job_id, benchmark_id=benchmark_id)
+        if job.status == "completed":
+            return await client.alpha.eval.jobs.retrieve(job_id, benchmark_id=benchmark_id)
+        if job.status in ("failed", "cancelled"):
+            raise RuntimeError(f"Eval job {job_id} {job.status}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, cap)
@@ -0,0 +1,34 @@
+"""
+Environment configuration shared by the eval scripts.
+
+load_config() reads .env once per process and returns a read-only mapping,
+so a driver that runs several scripts does not re-read the file each time.
+Unset variables map to None; scripts apply their own defaults.
+"""
+
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+from dotenv import load_dotenv
+
+ENV_VARS = {
+    "base_url": "LLAMA_STACK_BASE_URL",
+    "inference_model": "INFERENCE_MODEL",
+    "judge_model": "JUDGE_MODEL",
+    "candidate_model": "CANDIDATE_MODEL",
+    "benchmark_id": "LLAMA_STACK_BENCHMARK_ID",
+    "benchmark_provider_id": "LLAMA_STACK_BENCHMARK_PROVIDER_ID",
+    "job_id": "LLAMA_STACK_JOB_ID",
+    "dataset_uri": "LLAMA_STACK_DATASET_URI",
+    "dataset_provider_id": "LLAMA_STACK_DATASET_PROVIDER_ID",
+    "agent_evals_customer_dataset_uri": "AGENT_EVALS_CUSTOMER_DATASET_URI",
+    "llm_cache": "EVALS_LLM_CACHE",
+}
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """Load .env and return the eval settings as a read-only mapping."""
+    load_dotenv()
+    return MappingProxyType({key: os.getenv(var) for key, var in ENV_VARS.items()})
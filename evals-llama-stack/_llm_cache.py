@@ -0,0 +1,43 @@
+"""
+On-disk cache of deterministic chat completions for the eval scripts.
+
+At temperature 0.0 an answer depends only on (model, prompt), so re-running a
+script during iteration can reuse the previous answer instead of calling the
+model again. Set EVALS_LLM_CACHE=0 to always call the model.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger("evals")
+
+CACHE_DIR = Path.home() / ".cache" / "evals-llama-stack"
+
+
+def cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\x00{prompt}".encode()).hexdigest()
+
+
+def cache_path(base_url: str) -> Path:
+    """One cache file per server, since model IDs are only unique within a server."""
+    server = hashlib.blake2b(base_url.encode(), digest_size=8).hexdigest()
+    return CACHE_DIR / f"completions-{server}.json"
+
+
+def load_cache(path: Path) -> dict:
+    """Return the cached {key: content} mapping, or an empty one if unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    """Write the cache file, ignoring write failures."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache))
+    except OSError as e:
+        logger.debug(f"Could not write completion cache: {e}")
@@ -0,0 +1,22 @@
+"""
+Logging setup shared by the eval scripts.
+"""
+
+import logging
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def setup_logging(level=logging.INFO) -> logging.Logger:
+    """Configure message-only logging once per process and return the eval logger."""
+    logging.basicConfig(
+        level=level,
+        format='%(message)s',
+        force=True
+    )
+
+    # Suppress httpx INFO logs
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("llama_stack_client").setLevel(logging.WARNING)
+
+    return logging.getLogger("evals")
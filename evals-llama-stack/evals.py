@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Run one or more of the numbered eval scripts in a single Python process.
+
+Each script is a subcommand named after its file without the step number,
+e.g. 3_list_datasets.py -> list-datasets. Separate several subcommands with
+a lone comma so the interpreter and llama_stack_client imports are paid once:
+
+    python evals.py list-datasets
+    python evals.py review-eval-job <job_id>
+    python evals.py register-dataset-basic-subset-of , register-benchmark , execute-eval
+
+Only the scripts that are named get imported.
+"""
+
+import importlib
+import inspect
+import re
+import sys
+from pathlib import Path
+
+from _bootstrap import run
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+STEP_PREFIX = re.compile(r"^\d+_")
+
+
+def discover_commands():
+    """Map subcommand names to numbered script module names."""
+    commands = {}
+    scripts = SCRIPT_DIR.glob("[0-9]*_*.py")
+    for path in sorted(scripts, key=lambda p: (int(p.stem.split("_", 1)[0]), p.stem)):
+        command = STEP_PREFIX.sub("", path.stem).replace("_", "-")
+        commands[command] = path.stem
+    return commands
+
+
+def split_invocations(argv):
+    """Split argv on lone commas into [command, *args] groups."""
+    invocations = [[]]
+    for arg in argv:
+        if arg == ",":
+            invocations.append([])
+        else:
+            invocations[-1].append(arg)
+    return [inv for inv in invocations if inv]
+
+
+def run_script(module_name, args):
+    """Import a numbered script and run its main() with args as its argv."""
+    sys.argv = [f"{module_name}.py", *args]
+    module = importlib.import_module(module_name)
+    # Scripts without a main() (e.g. 4_basic_subset_of_scoring_function.py) run on import
+    main = getattr(module, "main", None)
+    if main is None:
+        return
+    if inspect.iscoroutinefunction(main):
+        run(main())
+    else:
+        main()
+
+
+def print_usage(commands, file=sys.stdout):
+    print(__doc__.strip(), file=file)
+    print("\nCommands:", file=file)
+    for command, module_name in commands.items():
+        print(f"  {command:40} {module_name}.py", file=file)
+
+
+def main():
+    commands = discover_commands()
+    invocations = split_invocations(sys.argv[1:])
+
+    if not invocations or invocations[0][0] in ("-h", "--help"):
+        print_usage(commands)
+        return
+
+    unknown = [inv[0] for inv in invocations if inv[0] not in commands]
+    if unknown:
+        print(f"Unknown command(s): {', '.join(unknown)}\n", file=sys.stderr)
+        print_usage(commands, file=sys.stderr)
+        sys.exit(2)
+
+    sys.path.insert(0, str(SCRIPT_DIR))
+    for command, *args in invocations:
+        run_script(commands[command], args)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,20 +14,22 @@ Environment Variables:
     CUSTOMER_API_BASE_URL: Base URL for the Customer API
     PORT_FOR_CUSTOMER_MCP: Port number for the MCP server (default: 9001)
     HOST_FOR_CUSTOMER_MCP: Host address to bind to (default: 0.0.0.0) 
+    CACHE_TTL_FOR_CUSTOMER_MCP: Seconds to reuse a successful read response (default: 60, 0 disables)
                           
 """
 
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 import asyncio
 import httpx
+import orjson
+import time
 import os
 import logging
 from typing import Optional, Dict, Any
 
-# Initialize FastMCP server
-mcp = FastMCP("customer-api")
-
 # Load environment variables from .env file
 load_dotenv()
 
@@ -36,34 +38,149 @@ port = int(os.getenv("PORT_FOR_CUSTOMER_MCP", "9001"))
 host = os.getenv("HOST_FOR_CUSTOMER_MCP", "0.0.0.0")
 BASE_URL = os.getenv("CUSTOMER_API_BASE_URL")
 
+# Absolute endpoint URLs, built once; httpx only merges relative URLs with base_url,
+# so passing these skips that work on every request
+API_ROOT = (BASE_URL or "").rstrip("/")
+CUSTOMERS_URL = f"{API_ROOT}/api/customers"
 
-# HTTP client for API calls
+
+# HTTP client for API calls, opened once at startup by lifespan()
 http_client: Optional[httpx.AsyncClient] = None
 
+# Connection pool for the Customer API. Agents fan out several tool calls at once, so keep
+# enough warm connections to avoid reconnecting per burst; 200 matches the default
+# worker thread count of the Spring Boot (Tomcat) backend, beyond which requests just queue.
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Adaptive cap on concurrent requests to the Customer API (AIMD): grow the cap while
+# responses stay fast, halve it when latency rises or the backend pushes back
+BACKEND_CONCURRENCY_START = 16
+BACKEND_CONCURRENCY_MAX = HTTP_LIMITS.max_connections
+# Seconds; the recent mean latency only counts as slow above both this and twice
+# the backend's usual latency
+BACKEND_TARGET_LATENCY = float(os.getenv("TARGET_LATENCY_FOR_CUSTOMER_MCP", "0.5"))
+BACKEND_OVERLOAD_STATUS = frozenset({429, 502, 503})
+RETRY_AFTER_DEFAULT = 1.0  # seconds to back off when the backend sends no Retry-After
+RETRY_AFTER_CAP = 30.0
+
+# In-process cache of successful read responses, so an agent re-asking for the same
+# record within the TTL does not hit the Customer API again
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = float(os.getenv("CACHE_TTL_FOR_CUSTOMER_MCP", "60"))
+# The unfiltered customer list is the most common call and changes rarely, so it is kept longer
+LIST_ALL_CACHE_TTL = float(os.getenv("CACHE_TTL_FOR_CUSTOMER_LIST_ALL", "300"))
+response_cache = OrderedDict()
+# Requests currently being sent, keyed like the cache, so duplicates can share them
+inflight_requests: Dict[tuple, asyncio.Future] = {}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for backend requests.
+
+    An overload status or transport error multiplies the limit by decrease.
+    Latency is only judged once min_samples responses have arrived since the
+    last cut: a window whose mean is above both target_latency and tolerance
+    times the baseline (a slow moving average of window means, i.e. the
+    backend's usual latency) multiplies the limit by decrease, any other
+    success adds increase.
+    """
+
+    def __init__(self, start: int, maximum: int, target_latency: float,
+                 increase: float = 0.5, decrease: float = 0.5, window: int = 32,
+                 min_samples: int = 8, tolerance: float = 2.0, smoothing: float = 0.1):
+        self.limit = float(start)
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline: Optional[float] = None
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait until the number of in-flight requests is under the current limit."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def record(self, latency: float, overloaded: bool) -> None:
+        self.latencies.append(latency)
+        if overloaded:
+            self._cut()
+            return
+        if len(self.latencies) < self.min_samples:
+            return
+        mean = sum(self.latencies) / len(self.latencies)
+        if self.baseline is None:
+            self.baseline = mean
+        else:
+            self.baseline += (mean - self.baseline) * self.smoothing
+        if mean > max(self.target_latency, self.tolerance * self.baseline):
+            self._cut()
+        else:
+            self.limit = min(float(self.maximum), self.limit + self.increase)
 
-async def get_http_client() -> httpx.AsyncClient:
-    """Get or create HTTP client."""
+    def _cut(self) -> None:
+        self.limit = max(1.0, self.limit * self.decrease)
+        # Judge the new limit on min_samples fresh samples, not the window that triggered the cut
+        self.latencies.clear()
+
+
+def retry_after(response: httpx.Response) -> float:
+    """Seconds the backend asked us to wait via Retry-After, or RETRY_AFTER_DEFAULT."""
+    try:
+        return min(max(float(response.headers["Retry-After"]), 0.0), RETRY_AFTER_CAP)
+    except (KeyError, ValueError):
+        # Missing, or the HTTP-date form, which the Spring backends do not use
+        return RETRY_AFTER_DEFAULT
+
+
+backend_limiter = AdaptiveLimiter(BACKEND_CONCURRENCY_START, BACKEND_CONCURRENCY_MAX, BACKEND_TARGET_LATENCY)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Open the shared HTTP client when the server starts and close it on shutdown."""
     global http_client
-    if http_client is None:
-        http_client = httpx.AsyncClient(base_url=BASE_URL, timeout=30.0)
-    return http_client
+    http_client = httpx.AsyncClient(base_url=BASE_URL, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
 
+# Initialize FastMCP server
+mcp = FastMCP("customer-api", lifespan=lifespan)
 
-async def handle_response(response: httpx.Response) -> Dict[str, Any]:
-    """Handle HTTP response and return JSON or error message"""
+
+async def handle_response(response: httpx.Response, list_result: bool = False) -> Dict[str, Any]:
+    """Handle HTTP response and return JSON or error message
+
+    list_result marks endpoints that return a JSON array; MCP requires dict
+    responses, so their body is wrapped as {"results": [...]}.
+    """
     try:
         response.raise_for_status()
         if response.content:
-            data = response.json()
-            # MCP requires dict responses, so wrap lists in a dict
-            if isinstance(data, list):
-                return {"results": data}
-            return data
+            data = orjson.loads(response.content)
+            return {"results": data} if list_result else data
         return {"status": "success", "status_code": response.status_code}
     except httpx.HTTPStatusError as e:
         error_detail = ""
         try:
-            error_detail = e.response.json()
+            error_detail = orjson.loads(e.response.content)
         except:
             error_detail = e.response.text
         return {
@@ -75,6 +192,74 @@ async def handle_response(response: httpx.Response) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+def _cache_get(key: tuple):
+    """Return the cached response for key, or None if missing or expired."""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.monotonic() > expires_at:
+        del response_cache[key]
+        return None
+    response_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value, ttl: float) -> None:
+    """Store a response for ttl seconds, evicting the least recently used entry when full."""
+    response_cache[key] = (time.monotonic() + ttl, value)
+    response_cache.move_to_end(key)
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send one request within the backend limiter and report how it went."""
+    async with backend_limiter.slot():
+        started = time.monotonic()
+        try:
+            response = await http_client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            backend_limiter.record(time.monotonic() - started, overloaded=True)
+            raise
+        backend_limiter.record(time.monotonic() - started, response.status_code in BACKEND_OVERLOAD_STATUS)
+    return response
+
+
+async def _fetch(key: tuple, method: str, url: str, list_result: bool, ttl: float, **kwargs) -> Dict[str, Any]:
+    response = await _send(method, url, **kwargs)
+    if response.status_code in BACKEND_OVERLOAD_STATUS:
+        # The limiter has already cut concurrency; wait as asked without holding
+        # a slot, then retry once
+        await asyncio.sleep(retry_after(response))
+        response = await _send(method, url, **kwargs)
+    data = await handle_response(response, list_result)
+    if "error" not in data:
+        _cache_put(key, data, ttl)
+    return data
+
+
+async def cached_request(
+    method: str, url: str, list_result: bool = False, ttl: float = RESPONSE_CACHE_TTL, **kwargs
+) -> Dict[str, Any]:
+    """Send a read-only request through the response cache; errors are never cached.
+
+    Identical requests that arrive while one is already in flight wait for its
+    result instead of sending their own.
+    """
+    key = (method, url, repr(sorted(kwargs.items())))
+    data = _cache_get(key)
+    if data is not None:
+        return data
+    task = inflight_requests.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(key, method, url, list_result, ttl, **kwargs))
+        inflight_requests[key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(key, None))
+    # Shield so one caller being cancelled does not cancel the fetch others are awaiting
+    return await asyncio.shield(task)
+
+
 @mcp.tool()
 async def search_customers(
     company_name: Optional[str] = None,
@@ -94,20 +279,21 @@ async def search_customers(
     Returns:
         List of customers matching the search criteria
     """
-    params = {}
-
-    if company_name:
-        params["companyName"] = company_name
-    if contact_name:
-        params["contactName"] = contact_name
-    if contact_email:
-        params["contactEmail"] = contact_email
-    if phone:
-        params["phone"] = phone
+    # Only send the filters that were given
+    params = {
+        name: value
+        for name, value in (
+            ("companyName", company_name),
+            ("contactName", contact_name),
+            ("contactEmail", contact_email),
+            ("phone", phone),
+        )
+        if value
+    }
+    if not params:
+        return await cached_request("GET", CUSTOMERS_URL, list_result=True, ttl=LIST_ALL_CACHE_TTL)
 
-    client = await get_http_client()
-    response = await client.get("/api/customers", params=params)
-    return await handle_response(response)
+    return await cached_request("GET", CUSTOMERS_URL, list_result=True, params=params)
 
 
 @mcp.tool()
@@ -125,17 +311,7 @@ async def get_customer(customer_id: str) -> Dict[str, Any]:
         address, city, region, postalCode, country, phone, fax, contactEmail,
         createdAt, and updatedAt
     """
-    client = await get_http_client()
-    response = await client.get(f"/api/customers/{customer_id}")
-    return await handle_response(response)
-
-
-async def cleanup():
-    """Cleanup resources."""
-    global http_client
-    if http_client:
-        await http_client.aclose()
-        http_client = None
+    return await cached_request("GET", f"{CUSTOMERS_URL}/{customer_id}")
 
 
 if __name__ == "__main__":
@@ -155,8 +331,13 @@ if __name__ == "__main__":
     logger.info(f"  HOST_FOR_CUSTOMER_MCP: {host}")
     logger.info("=" * 60)
 
+    # mcp.run() starts its loop through anyio, which follows the asyncio loop policy
     try:
-        mcp.run(transport="http", port=port, host=host)
-    finally:
-        asyncio.run(cleanup())
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
+    mcp.run(transport="http", port=port, host=host)
 
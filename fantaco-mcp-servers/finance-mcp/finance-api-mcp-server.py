@@ -14,18 +14,20 @@ Environment Variables:
     FINANCE_API_BASE_URL: Base URL for the Finance API
     PORT_FOR_FINANCE_MCP: Port number for the MCP server (default: 9002)
     HOST_FOR_FINANCE_MCP: Host address to bind to (default: 0.0.0.0)
+    CACHE_TTL_FOR_FINANCE_MCP: Seconds to reuse a successful read response (default: 60, 0 disables)
 """
 
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 import asyncio
 import httpx
+import orjson
+import time
 import os
 import logging
-from typing import Optional, Dict, Any
-
-# Initialize FastMCP server
-mcp = FastMCP("finance-api")
+from typing import Optional, Dict, Any, List
 
 # Load environment variables from .env file
 load_dotenv()
@@ -35,33 +37,147 @@ port = int(os.getenv("PORT_FOR_FINANCE_MCP", "9002"))
 host = os.getenv("HOST_FOR_FINANCE_MCP", "0.0.0.0")
 BASE_URL = os.getenv("FINANCE_API_BASE_URL")
 
-# HTTP client for API calls
+# Absolute endpoint URLs, built once; httpx only merges relative URLs with base_url,
+# so passing these skips that work on every request
+API_ROOT = (BASE_URL or "").rstrip("/")
+ORDER_HISTORY_URL = f"{API_ROOT}/api/finance/orders/history"
+INVOICE_HISTORY_URL = f"{API_ROOT}/api/finance/invoices/history"
+
+# HTTP client for API calls, opened once at startup by lifespan()
 http_client: Optional[httpx.AsyncClient] = None
 
+# Connection pool for the Finance API. Agents fan out several tool calls at once, so keep
+# enough warm connections to avoid reconnecting per burst; 200 matches the default
+# worker thread count of the Spring Boot (Tomcat) backend, beyond which requests just queue.
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Adaptive cap on concurrent requests to the Finance API (AIMD): grow the cap while
+# responses stay fast, halve it when latency rises or the backend pushes back
+BACKEND_CONCURRENCY_START = 16
+BACKEND_CONCURRENCY_MAX = HTTP_LIMITS.max_connections
+# Seconds; the recent mean latency only counts as slow above both this and twice
+# the backend's usual latency
+BACKEND_TARGET_LATENCY = float(os.getenv("TARGET_LATENCY_FOR_FINANCE_MCP", "0.5"))
+BACKEND_OVERLOAD_STATUS = frozenset({429, 502, 503})
+RETRY_AFTER_DEFAULT = 1.0  # seconds to back off when the backend sends no Retry-After
+RETRY_AFTER_CAP = 30.0
+
+# In-process cache of successful read responses, so an agent re-asking for the same
+# record within the TTL does not hit the Finance API again
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = float(os.getenv("CACHE_TTL_FOR_FINANCE_MCP", "60"))
+response_cache = OrderedDict()
+# Requests currently being sent, keyed like the cache, so duplicates can share them
+inflight_requests: Dict[tuple, asyncio.Future] = {}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for backend requests.
+
+    An overload status or transport error multiplies the limit by decrease.
+    Latency is only judged once min_samples responses have arrived since the
+    last cut: a window whose mean is above both target_latency and tolerance
+    times the baseline (a slow moving average of window means, i.e. the
+    backend's usual latency) multiplies the limit by decrease, any other
+    success adds increase.
+    """
+
+    def __init__(self, start: int, maximum: int, target_latency: float,
+                 increase: float = 0.5, decrease: float = 0.5, window: int = 32,
+                 min_samples: int = 8, tolerance: float = 2.0, smoothing: float = 0.1):
+        self.limit = float(start)
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline: Optional[float] = None
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self._changed = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait until the number of in-flight requests is under the current limit."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self.in_flight -= 1
+                self._changed.notify_all()
+
+    def record(self, latency: float, overloaded: bool) -> None:
+        self.latencies.append(latency)
+        if overloaded:
+            self._cut()
+            return
+        if len(self.latencies) < self.min_samples:
+            return
+        mean = sum(self.latencies) / len(self.latencies)
+        if self.baseline is None:
+            self.baseline = mean
+        else:
+            self.baseline += (mean - self.baseline) * self.smoothing
+        if mean > max(self.target_latency, self.tolerance * self.baseline):
+            self._cut()
+        else:
+            self.limit = min(float(self.maximum), self.limit + self.increase)
+
+    def _cut(self) -> None:
+        self.limit = max(1.0, self.limit * self.decrease)
+        # Judge the new limit on min_samples fresh samples, not the window that triggered the cut
+        self.latencies.clear()
+
+
+def retry_after(response: httpx.Response) -> float:
+    """Seconds the backend asked us to wait via Retry-After, or RETRY_AFTER_DEFAULT."""
+    try:
+        return min(max(float(response.headers["Retry-After"]), 0.0), RETRY_AFTER_CAP)
+    except (KeyError, ValueError):
+        # Missing, or the HTTP-date form, which the Spring backends do not use
+        return RETRY_AFTER_DEFAULT
+
+
+backend_limiter = AdaptiveLimiter(BACKEND_CONCURRENCY_START, BACKEND_CONCURRENCY_MAX, BACKEND_TARGET_LATENCY)
 
-async def get_http_client() -> httpx.AsyncClient:
-    """Get or create HTTP client."""
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Open the shared HTTP client when the server starts and close it on shutdown."""
     global http_client
-    if http_client is None:
-        http_client = httpx.AsyncClient(base_url=BASE_URL, timeout=30.0)
-    return http_client
+    http_client = httpx.AsyncClient(base_url=BASE_URL, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("finance-api", lifespan=lifespan)
+
 
+async def handle_response(response: httpx.Response, list_result: bool = False) -> Dict[str, Any]:
+    """Handle HTTP response and return JSON or error message
 
-async def handle_response(response: httpx.Response) -> Dict[str, Any]:
-    """Handle HTTP response and return JSON or error message"""
+    list_result marks endpoints that return a JSON array; MCP requires dict
+    responses, so their body is wrapped as {"results": [...]}.
+    """
     try:
         response.raise_for_status()
         if response.content:
-            data = response.json()
-            # MCP requires dict responses, so wrap lists in a dict
-            if isinstance(data, list):
-                return {"results": data}
-            return data
+            data = orjson.loads(response.content)
+            return {"results": data} if list_result else data
         return {"status": "success", "status_code": response.status_code}
     except httpx.HTTPStatusError as e:
         error_detail = ""
         try:
-            error_detail = e.response.json()
+            error_detail = orjson.loads(e.response.content)
         except:
             error_detail = e.response.text
         return {
@@ -74,6 +190,74 @@ async def handle_response(response: httpx.Response) -> Dict[str, Any]:
 
 
 
+def _cache_get(key: tuple):
+    """Return the cached response for key, or None if missing or expired."""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.monotonic() > expires_at:
+        del response_cache[key]
+        return None
+    response_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value, ttl: float) -> None:
+    """Store a response for ttl seconds, evicting the least recently used entry when full."""
+    response_cache[key] = (time.monotonic() + ttl, value)
+    response_cache.move_to_end(key)
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+
+async def _send(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send one request within the backend limiter and report how it went."""
+    async with backend_limiter.slot():
+        started = time.monotonic()
+        try:
+            response = await http_client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            backend_limiter.record(time.monotonic() - started, overloaded=True)
+            raise
+        backend_limiter.record(time.monotonic() - started, response.status_code in BACKEND_OVERLOAD_STATUS)
+    return response
+
+
+async def _fetch(key: tuple, method: str, url: str, list_result: bool, ttl: float, **kwargs) -> Dict[str, Any]:
+    response = await _send(method, url, **kwargs)
+    if response.status_code in BACKEND_OVERLOAD_STATUS:
+        # The limiter has already cut concurrency; wait as asked without holding
+        # a slot, then retry once
+        await asyncio.sleep(retry_after(response))
+        response = await _send(method, url, **kwargs)
+    data = await handle_response(response, list_result)
+    if "error" not in data:
+        _cache_put(key, data, ttl)
+    return data
+
+
+async def cached_request(
+    method: str, url: str, list_result: bool = False, ttl: float = RESPONSE_CACHE_TTL, **kwargs
+) -> Dict[str, Any]:
+    """Send a read-only request through the response cache; errors are never cached.
+
+    Identical requests that arrive while one is already in flight wait for its
+    result instead of sending their own.
+    """
+    key = (method, url, repr(sorted(kwargs.items())))
+    data = _cache_get(key)
+    if data is not None:
+        return data
+    task = inflight_requests.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(key, method, url, list_result, ttl, **kwargs))
+        inflight_requests[key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(key, None))
+    # Shield so one caller being cancelled does not cancel the fetch others are awaiting
+    return await asyncio.shield(task)
+
+
 @mcp.tool()
 async def fetch_order_history(
     customer_id: str,
@@ -99,23 +283,16 @@ async def fetch_order_history(
         - data: List of order objects with details (id, orderNumber, customerId, totalAmount, status, orderDate, etc.)
         - count: Number of orders returned
     """
-    client = await get_http_client()
 
-    # Build request payload
+    # Build request payload, adding the date filters only when given
     payload = {
         "customerId": customer_id,
-        "limit": limit
+        "limit": limit,
+        **{name: value for name, value in (("startDate", start_date), ("endDate", end_date)) if value},
     }
 
-    if start_date:
-        payload["startDate"] = start_date
-    if end_date:
-        payload["endDate"] = end_date
-
-    # Make POST request
-    response = await client.post("/api/finance/orders/history", json=payload)
-
-    return await handle_response(response)
+    # Make POST request (a read-only history query, so it is safe to cache)
+    return await cached_request("POST", ORDER_HISTORY_URL, json=payload)
 
 
 @mcp.tool()
@@ -143,31 +320,81 @@ async def fetch_invoice_history(
         - data: List of invoice objects with details (id, invoiceNumber, orderId, customerId, amount, status, invoiceDate, dueDate, paidDate, etc.)
         - count: Number of invoices returned
     """
-    client = await get_http_client()
 
-    # Build request payload
+    # Build request payload, adding the date filters only when given
     payload = {
         "customerId": customer_id,
-        "limit": limit
+        "limit": limit,
+        **{name: value for name, value in (("startDate", start_date), ("endDate", end_date)) if value},
     }
 
-    if start_date:
-        payload["startDate"] = start_date
-    if end_date:
-        payload["endDate"] = end_date
+    # Make POST request (a read-only history query, so it is safe to cache)
+    return await cached_request("POST", INVOICE_HISTORY_URL, json=payload)
 
-    # Make POST request
-    response = await client.post("/api/finance/invoices/history", json=payload)
 
-    return await handle_response(response)
+# Tools batch_execute may dispatch to. @mcp.tool() wraps each function in a
+# FunctionTool, so call the underlying coroutine function via .fn
+BATCH_TOOLS = {tool.name: tool.fn for tool in (fetch_order_history, fetch_invoice_history)}
 
 
-async def cleanup():
-    """Cleanup resources."""
-    global http_client
-    if http_client:
-        await http_client.aclose()
-        http_client = None
+@mcp.tool()
+async def batch_execute(
+    calls: List[Dict[str, Any]],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False
+) -> Dict[str, Any]:
+    """
+    Run several finance tool calls in one request.
+
+    Use this instead of separate calls when you need, for example, both the orders
+    and the invoices for a customer, or the same history for several customers.
+    The calls run in parallel.
+
+    Args:
+        calls: List of calls, each {"name": <tool name>, "arguments": {...}}. Supported
+               tools: fetch_order_history, fetch_invoice_history
+               (e.g., [{"name": "fetch_order_history", "arguments": {"customer_id": "LONEP"}},
+                       {"name": "fetch_invoice_history", "arguments": {"customer_id": "LONEP"}}])
+        max_concurrent: Maximum number of calls to run at the same time (default: 8)
+        stop_on_error: Cancel the remaining calls after the first failure (default: False)
+
+    Returns:
+        Dictionary containing:
+        - results: One entry per call, in the same order; the tool's result, or null if it failed or was cancelled
+        - errors: List of failures with the call index, tool name and error details
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def run_call(index: int, call: Dict[str, Any]):
+        name = call.get("name")
+        tool = BATCH_TOOLS.get(name)
+        if tool is None:
+            return index, {"error": f"Unknown tool: {name}"}
+        async with semaphore:
+            try:
+                return index, await tool(**(call.get("arguments") or {}))
+            except Exception as e:
+                return index, {"error": str(e)}
+
+    tasks = [asyncio.ensure_future(run_call(i, call)) for i, call in enumerate(calls)]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+    errors = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, data = await next_done
+            if "error" in data:
+                errors.append({"index": index, "name": calls[index].get("name"), **data})
+                if stop_on_error:
+                    break
+            else:
+                results[index] = data
+    finally:
+        # Only still-pending calls are affected (after stop_on_error, or if this call is cancelled)
+        for task in tasks:
+            task.cancel()
+
+    errors.sort(key=lambda e: e["index"])
+    return {"results": results, "errors": errors}
 
 
 if __name__ == "__main__":
@@ -186,7 +413,12 @@ if __name__ == "__main__":
     logger.info(f"  HOST_FOR_FINANCE_MCP: {host}")
     logger.info("=" * 60)
 
+    # mcp.run() starts its loop through anyio, which follows the asyncio loop policy
     try:
-        mcp.run(transport="http", port=port, host=host)
-    finally:
-        asyncio.run(cleanup())
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
+    mcp.run(transport="http", port=port, host=host)
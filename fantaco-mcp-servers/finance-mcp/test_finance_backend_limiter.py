@@ -0,0 +1,71 @@
+"""
+Tests for the backend concurrency limiter and overload retry in finance-api-mcp-server.py.
+
+Run with: pytest test_finance_backend_limiter.py
+"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import httpx
+
+spec = importlib.util.spec_from_file_location(
+    "finance_api_mcp_server", Path(__file__).with_name("finance-api-mcp-server.py")
+)
+server = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(server)
+
+
+def make_limiter(**kwargs):
+    return server.AdaptiveLimiter(start=16, maximum=200, target_latency=0.5, **kwargs)
+
+
+def test_steady_latency_above_target_does_not_collapse_limit():
+    limiter = make_limiter()
+    for _ in range(500):
+        limiter.record(0.6, overloaded=False)
+    assert limiter.limit >= 16
+
+
+def test_latency_jump_cuts_limit():
+    limiter = make_limiter()
+    for _ in range(100):
+        limiter.record(0.1, overloaded=False)
+    before = limiter.limit
+    for _ in range(limiter.min_samples):
+        limiter.record(2.0, overloaded=False)
+    assert limiter.limit < before
+
+
+def test_latency_is_not_judged_before_min_samples():
+    limiter = make_limiter()
+    for _ in range(limiter.min_samples - 1):
+        limiter.record(5.0, overloaded=False)
+    assert limiter.limit == 16
+
+
+def test_overload_cuts_limit_immediately():
+    limiter = make_limiter()
+    limiter.record(0.1, overloaded=True)
+    assert limiter.limit == 8
+
+
+def test_overload_status_is_retried_once():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"orders": []})
+
+    async def run():
+        server.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await server.cached_request("POST", "http://api/orders", json={"customerId": "TEST1"})
+        finally:
+            await server.http_client.aclose()
+
+    assert asyncio.run(run()) == {"orders": []}
+    assert len(calls) == 2
@@ -29,20 +29,35 @@ Architecture:
 """
 
 import os
-import json
+import time
+import asyncio
+import hashlib
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from collections import OrderedDict
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient
 from mcp.server.fastmcp import FastMCP
 
-# Configure logging
+# Configure logging. The log file is written by a background listener thread, so a
+# tool call on the event loop only enqueues the record; the file rotates at 50 MB
+log_queue = queue.Queue(-1)
+log_file_listener = QueueListener(
+    log_queue,
+    RotatingFileHandler('mcp_server_llama_stack.log', maxBytes=50_000_000, backupCount=3)
+)
+log_file_listener.start()
+atexit.register(log_file_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('mcp_server_llama_stack.log')
+        QueueHandler(log_queue)
     ]
 )
 logger = logging.getLogger(__name__)
@@ -63,22 +78,68 @@ logger.info(f"FINANCE_AGENT_PORT: {FINANCE_AGENT_PORT}")
 logger.info("Initializing FastMCP server: Finance Agent MCP Server")
 mcp = FastMCP("Finance Agent MCP Server", port=FINANCE_AGENT_PORT)
 
-# Global Llama Stack client
+# Settings read once at startup rather than on every tool call
+LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
+INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "ollama/llama3.2:3b")
+MCP_FINANCE_SERVER_URL = os.getenv("MCP_FINANCE_SERVER_URL")
+
+# MCP tool definition passed to every responses.create call, built once
+_FINANCE_TOOLS = (
+    {
+        "type": "mcp",
+        "server_url": MCP_FINANCE_SERVER_URL,
+        "server_label": "FINANCE",
+    },
+)
+
+# In-process response cache for repeated prompts
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = float(os.getenv("FINANCE_AGENT_CACHE_TTL", "300"))
+response_cache = OrderedDict()
+
+
+def _cache_key(tool_name: str, prompt: str) -> tuple:
+    """Build a cache key from the tool, model, MCP server and normalized prompt."""
+    prompt_hash = hashlib.blake2b(prompt.strip().lower().encode(), digest_size=16).hexdigest()
+    return (tool_name, INFERENCE_MODEL, MCP_FINANCE_SERVER_URL, prompt_hash)
+
+
+def _cache_get(key: tuple):
+    """Return the cached response for key, or None if missing or expired."""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at > RESPONSE_CACHE_TTL:
+        del response_cache[key]
+        return None
+    response_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value) -> None:
+    """Store a response, evicting the least recently used entry when full."""
+    response_cache[key] = (time.monotonic(), value)
+    response_cache.move_to_end(key)
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+
+# Global async Llama Stack client, shared by all concurrent tool calls
 llama_client = None
 
 def get_llama_client():
-    """Get or create Llama Stack client."""
+    """Get or create the async Llama Stack client."""
     global llama_client
     if llama_client is None:
-        LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
         logger.info(f"Initializing Llama Stack client with base_url: {LLAMA_STACK_BASE_URL}")
-        llama_client = LlamaStackClient(base_url=LLAMA_STACK_BASE_URL)
+        llama_client = AsyncLlamaStackClient(base_url=LLAMA_STACK_BASE_URL)
         logger.info("Llama Stack client initialized successfully")
     return llama_client
 
 
 @mcp.tool()
-def finance_agent(prompt: str) -> str:
+async def finance_agent(prompt: str) -> str:
     """
     Execute the finance agent with the given prompt.
 
@@ -98,36 +159,31 @@ def finance_agent(prompt: str) -> str:
         - "Find orders with amount greater than 1000"
         - "List all pending invoices"
     """
-    logger.info(f"finance_agent called with prompt: {prompt}")
+    logger.info(f"finance_agent called with prompt: {prompt[:100]}...")
+    key = _cache_key("finance_agent", prompt)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Returning cached finance_agent response")
+        return cached
+
     try:
         client = get_llama_client()
 
-        INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "ollama/llama3.2:3b")
-        MCP_FINANCE_SERVER_URL = os.getenv("MCP_FINANCE_SERVER_URL")
-
-        logger.info(f"Using inference model: {INFERENCE_MODEL}")
-        logger.info(f"Using MCP finance server URL: {MCP_FINANCE_SERVER_URL}")
-
         if not MCP_FINANCE_SERVER_URL:
             logger.error("MCP_FINANCE_SERVER_URL not configured in environment")
             return "Error: MCP_FINANCE_SERVER_URL not configured in environment"
 
         # Use Llama Stack's Responses API with MCP tools
         logger.info("Calling Llama Stack responses.create API")
-        agent_responses = client.responses.create(
+        agent_responses = await client.responses.create(
             model=INFERENCE_MODEL,
             input=prompt,
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_url": MCP_FINANCE_SERVER_URL,
-                    "server_label": "FINANCE",
-                }
-            ],
+            tools=_FINANCE_TOOLS,
         )
 
         # Return the final text response
         logger.info(f"Agent response received: {agent_responses.output_text[:100]}...")
+        _cache_put(key, agent_responses.output_text)
         return agent_responses.output_text
 
     except Exception as e:
@@ -136,7 +192,7 @@ def finance_agent(prompt: str) -> str:
 
 
 @mcp.tool()
-def finance_agent_detailed(prompt: str) -> str:
+async def finance_agent_detailed(prompt: str) -> dict:
     """
     Execute the finance agent with detailed execution trace.
 
@@ -147,37 +203,33 @@ def finance_agent_detailed(prompt: str) -> str:
         prompt: The question or instruction for the finance agent
 
     Returns:
-        A detailed JSON string containing the execution trace and final response
+        A dict containing the execution trace and final response, which
+        FastMCP serializes once as structured tool output
     """
-    logger.info(f"finance_agent_detailed called with prompt: {prompt}")
+    logger.info(f"finance_agent_detailed called with prompt: {prompt[:100]}...")
+    key = _cache_key("finance_agent_detailed", prompt)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.info("Returning cached finance_agent_detailed response")
+        return cached
+
     try:
         client = get_llama_client()
 
-        INFERENCE_MODEL = os.getenv("INFERENCE_MODEL", "ollama/llama3.2:3b")
-        MCP_FINANCE_SERVER_URL = os.getenv("MCP_FINANCE_SERVER_URL")
-
-        logger.info(f"Using inference model: {INFERENCE_MODEL}")
-        logger.info(f"Using MCP finance server URL: {MCP_FINANCE_SERVER_URL}")
-
         if not MCP_FINANCE_SERVER_URL:
             logger.error("MCP_FINANCE_SERVER_URL not configured in environment")
-            return json.dumps({"error": "MCP_FINANCE_SERVER_URL not configured"})
+            return {"error": "MCP_FINANCE_SERVER_URL not configured"}
 
         # Use Llama Stack's Responses API with MCP tools
         logger.info("Calling Llama Stack responses.create API (detailed mode)")
-        agent_responses = client.responses.create(
+        agent_responses = await client.responses.create(
             model=INFERENCE_MODEL,
             input=prompt,
-            tools=[
-                {
-                    "type": "mcp",
-                    "server_url": MCP_FINANCE_SERVER_URL,
-                    "server_label": "FINANCE",
-                }
-            ],
+            tools=_FINANCE_TOOLS,
         )
 
-        # Build detailed trace
+        # Build detailed trace; the per-step debug messages use lazy %-formatting
+        # so nothing is formatted unless DEBUG logging is on
         logger.info("Building detailed execution trace")
         trace = []
         for i, output in enumerate(agent_responses.output):
@@ -189,7 +241,7 @@ def finance_agent_detailed(prompt: str) -> str:
             if output.type == "mcp_list_tools":
                 trace_item["server"] = output.server_label
                 trace_item["tools"] = [t.name for t in output.tools]
-                logger.debug(f"Step {i+1}: MCP list tools from {output.server_label}")
+                logger.debug("Step %d: MCP list tools from %s", i + 1, output.server_label)
 
             elif output.type == "mcp_call":
                 trace_item["tool_name"] = output.name
@@ -198,13 +250,13 @@ def finance_agent_detailed(prompt: str) -> str:
                     trace_item["error"] = output.error
                     logger.warning(f"Step {i+1}: MCP call {output.name} failed: {output.error}")
                 else:
-                    logger.debug(f"Step {i+1}: MCP call {output.name}")
+                    logger.debug("Step %d: MCP call %s", i + 1, output.name)
 
             elif output.type == "message":
                 trace_item["role"] = output.role
                 if hasattr(output.content[0], 'text'):
                     trace_item["content"] = output.content[0].text
-                logger.debug(f"Step {i+1}: Message from {output.role}")
+                logger.debug("Step %d: Message from %s", i + 1, output.role)
 
             trace.append(trace_item)
 
@@ -214,11 +266,12 @@ def finance_agent_detailed(prompt: str) -> str:
         }
 
         logger.info(f"Detailed agent response completed with {len(trace)} steps")
-        return json.dumps(result, indent=2)
+        _cache_put(key, result)
+        return result
 
     except Exception as e:
         logger.error(f"Error executing finance agent (detailed): {str(e)}", exc_info=True)
-        return json.dumps({"error": f"Error executing finance agent: {str(e)}"})
+        return {"error": f"Error executing finance agent: {str(e)}"}
 
 
 if __name__ == "__main__":
@@ -227,10 +280,6 @@ if __name__ == "__main__":
     logger.info("Starting MCP server with streamable-http transport...")
 
     # Log all environment variables used by this server
-    LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
-    INFERENCE_MODEL = os.getenv("INFERENCE_MODEL")
-    MCP_FINANCE_SERVER_URL = os.getenv("MCP_FINANCE_SERVER_URL")
-
     logger.info("=" * 60)
     logger.info("Environment Configuration:")
     logger.info(f"  LLAMA_STACK_BASE_URL: {LLAMA_STACK_BASE_URL}")
@@ -239,4 +288,12 @@ if __name__ == "__main__":
     logger.info(f"  FINANCE_AGENT_PORT: {FINANCE_AGENT_PORT}")
     logger.info("=" * 60)
 
+    # mcp.run() starts its loop through anyio, which follows the asyncio loop policy
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
     mcp.run(transport="streamable-http")
@@ -12,7 +12,9 @@ CURRENT STATUS:
 from llama_stack_client import Client
 from dotenv import load_dotenv
 import os
-import json
+import io
+import itertools
+import ijson
 import logging
 
 load_dotenv()
@@ -29,6 +31,7 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
 API_KEY = os.getenv("LLAMA_STACK_API_KEY")
 INFERENCE_MODEL = os.getenv("INFERENCE_MODEL")
+_BANNER = "=" * 50
 
 print(f"Base URL: {BASE_URL}")
 print(f"Model:    {INFERENCE_MODEL}")
@@ -43,9 +46,9 @@ def fetch_order_history_by_customer(customer_id="AROUT"):
     """Fetch order history using Llama Stack tool_runtime to invoke finance MCP tool directly"""
 
     try:
-        print("\n" + "=" * 50)
+        print("\n" + _BANNER)
         print(f"Fetching order history for customer: {customer_id}")
-        print("=" * 50)
+        print(_BANNER)
 
         # Invoke the fetch_order_history tool directly
         result = client.tool_runtime.invoke_tool(
@@ -58,36 +61,38 @@ def fetch_order_history_by_customer(customer_id="AROUT"):
             for content_item in result.content:
                 if hasattr(content_item, 'text'):
                     try:
-                        order_data = json.loads(content_item.text)
-
-                        # Check for different response formats
-                        if 'data' in order_data and order_data.get('data'):
-                            orders = order_data['data']
-                        elif 'orders' in order_data and order_data.get('orders'):
-                            orders = order_data['orders']
-                        else:
-                            orders = None
-
-                        if orders:
-                            print("\n" + "=" * 50)
+                        # Stream orders one record at a time instead of building the full dict tree
+                        payload = content_item.text.encode('utf-8')
+                        orders = ijson.items(io.BytesIO(payload), 'data.item')
+                        first_order = next(orders, None)
+                        if first_order is None:
+                            orders = ijson.items(io.BytesIO(payload), 'orders.item')
+                            first_order = next(orders, None)
+
+                        if first_order is not None:
+                            print("\n" + _BANNER)
                             print(f"ORDER HISTORY FOR CUSTOMER: {customer_id}")
-                            print("=" * 50)
-
-                            for idx, order in enumerate(orders, 1):
-                                print(f"\nOrder #{idx}:")
-                                print(f"  Order ID:     {order.get('id', order.get('orderId', 'N/A'))}")
-                                print(f"  Order Number: {order.get('orderNumber', 'N/A')}")
-                                print(f"  Order Date:   {order.get('orderDate', 'N/A')}")
-                                print(f"  Status:       {order.get('status', 'N/A')}")
-                                print(f"  Total Amount: ${order.get('totalAmount', order.get('freight', 'N/A'))}")
-
-                            print("\n" + "=" * 50)
-                            print(f"Total Orders Found: {len(orders)}")
-                            print("=" * 50 + "\n")
+                            print(_BANNER)
+
+                            order_count = 0
+                            for idx, order in enumerate(itertools.chain([first_order], orders), 1):
+                                print("\n".join([
+                                    f"\nOrder #{idx}:",
+                                    f"  Order ID:     {order.get('id', order.get('orderId', 'N/A'))}",
+                                    f"  Order Number: {order.get('orderNumber', 'N/A')}",
+                                    f"  Order Date:   {order.get('orderDate', 'N/A')}",
+                                    f"  Status:       {order.get('status', 'N/A')}",
+                                    f"  Total Amount: ${order.get('totalAmount', order.get('freight', 'N/A'))}",
+                                ]))
+                                order_count = idx
+
+                            print("\n" + _BANNER)
+                            print(f"Total Orders Found: {order_count}")
+                            print(_BANNER + "\n")
                         else:
                             print(f"No orders found for customer: {customer_id}")
 
-                    except json.JSONDecodeError:
+                    except ijson.JSONError:
                         print("Could not parse response as JSON")
                         print(f"Raw response: {content_item.text}")
         else:
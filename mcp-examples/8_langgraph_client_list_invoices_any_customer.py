@@ -1,12 +1,12 @@
 from langgraph.graph import StateGraph, END, START
 from langchain_openai import ChatOpenAI
-from typing import Annotated
+from llama_stack_client import Client
+from pydantic import BaseModel, ValidationError
+from typing import Optional, Union
 from typing_extensions import TypedDict
-from langgraph.graph.message import add_messages
 
 import os
 import sys
-import json
 import logging
 from dotenv import load_dotenv
 
@@ -18,6 +18,8 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 BASE_URL = os.getenv("LLAMA_STACK_BASE_URL")
 INFERENCE_MODEL = os.getenv("INFERENCE_MODEL")
 API_KEY = os.getenv("API_KEY")
+LLAMA_STACK_API_KEY = os.getenv("LLAMA_STACK_API_KEY")
+_BANNER = "=" * 50
 
 print(f"Base URL: {BASE_URL}")
 print(f"Model:    {INFERENCE_MODEL}")
@@ -30,41 +32,129 @@ llm = ChatOpenAI(
     use_responses_api=True
 )
 
-print("Testing LLM connectivity...")
-connectivity_response = llm.invoke("Hello")
-print("LLM connectivity OK")
-
-# MCP tool binding - both customer and finance MCP servers
-llm_with_tools = llm.bind(
-    tools=[
-        {
-            "type": "mcp",
-            "server_label": "customer_mcp",
-            "server_url": os.getenv("CUSTOMER_MCP_SERVER_URL"),
-            "require_approval": "never",
-        },
-        {
-            "type": "mcp",
-            "server_label": "finance_mcp",
-            "server_url": os.getenv("FINANCE_MCP_SERVER_URL"),
-            "require_approval": "never",
-        },
-    ])
+
+def _probe():
+    """Check LLM connectivity once; set SKIP_LLM_PROBE=1 to skip on repeated runs"""
+    print("Testing LLM connectivity...")
+    llm.invoke("Hello")
+    print("LLM connectivity OK")
+
+
+# Llama Stack client used to call the MCP tools directly (no LLM round trip)
+client = Client(
+    base_url=BASE_URL,
+    api_key=LLAMA_STACK_API_KEY
+)
+
+
+class Customer(BaseModel):
+    customerId: str
+    companyName: Optional[str] = None
+    contactName: Optional[str] = None
+    contactEmail: Optional[str] = None
+
+
+class Invoice(BaseModel):
+    id: Optional[Union[str, int]] = None
+    invoiceId: Optional[Union[str, int]] = None
+    invoiceNumber: Optional[str] = None
+    invoiceDate: Optional[str] = None
+    status: Optional[str] = None
+    totalAmount: Optional[Union[str, int, float]] = None
+    amount: Optional[Union[str, int, float]] = None
+
+
+class CustomerSearchResult(BaseModel):
+    results: list[Customer] = []
+
+
+class InvoiceHistory(BaseModel):
+    data: list[Invoice] = []
+    invoices: list[Invoice] = []
+
+
+class InvoiceList(BaseModel):
+    customer: Optional[Customer] = None
+    invoices: list[Invoice] = []
+
+
+def invoke_mcp_tool(tool_name: str, kwargs: dict, model: type[BaseModel]) -> Optional[BaseModel]:
+    """Invoke an MCP tool through Llama Stack tool_runtime and validate its JSON output into model"""
+    result = client.tool_runtime.invoke_tool(tool_name=tool_name, kwargs=kwargs)
+
+    if result and hasattr(result, 'content') and result.content:
+        for content_item in result.content:
+            if hasattr(content_item, 'text'):
+                try:
+                    return model.model_validate_json(content_item.text)
+                except ValidationError:
+                    print("Could not parse tool output")
+    return None
+
+
+def search_customer(email: str) -> Optional[Customer]:
+    """Look up a customer by email using the customer MCP server"""
+    output = invoke_mcp_tool("search_customers", {"contact_email": email}, CustomerSearchResult)
+    if output and output.results:
+        return output.results[0]
+    return None
+
+
+def list_invoices(customer_id: str) -> list[Invoice]:
+    """Fetch the invoice history for a customer using the finance MCP server"""
+    output = invoke_mcp_tool("fetch_invoice_history", {"customer_id": customer_id}, InvoiceHistory)
+    if not output:
+        return []
+    return output.data or output.invoices
 
 
 class State(TypedDict):
-    messages: Annotated[list, add_messages]
+    email: str
+    result: InvoiceList
+    summary: str
+
+
+# Process-local email -> customer mapping so repeat lookups skip the customer MCP call
+EMAIL_CACHE: dict[str, Customer] = {}
+
+
+def search_customer_node(state: State):
+    email = state["email"]
+    customer = EMAIL_CACHE.get(email)
+    if customer is None:
+        customer = search_customer(email)
+        if customer:
+            EMAIL_CACHE[email] = customer
+    return {"result": InvoiceList(customer=customer)}
+
 
+def list_invoices_node(state: State):
+    result = state["result"]
+    if not result.customer:
+        return {}
+    invoices = list_invoices(result.customer.customerId)
+    return {"result": result.model_copy(update={"invoices": invoices})}
+
+
+def summarize(state: State):
+    # Only the final summary needs the LLM; the tool calls above are deterministic
+    prompt = (
+        f"Summarize the invoice history for the customer with email {state['email']}.\n"
+        f"{state['result'].model_dump_json(exclude_none=True)}"
+    )
+    message = llm.invoke(prompt)
+    return {"summary": message.text}
 
-def chatbot(state: State):
-    message = llm_with_tools.invoke(state["messages"])
-    return {"messages": [message]}
 
 graph_builder = StateGraph(State)
 
-graph_builder.add_node("chatbot", chatbot)
-graph_builder.add_edge(START, "chatbot")
-graph_builder.add_edge("chatbot", END)
+graph_builder.add_node("search_customer", search_customer_node)
+graph_builder.add_node("list_invoices", list_invoices_node)
+graph_builder.add_node("summarize", summarize)
+graph_builder.add_edge(START, "search_customer")
+graph_builder.add_edge("search_customer", "list_invoices")
+graph_builder.add_edge("list_invoices", "summarize")
+graph_builder.add_edge("summarize", END)
 
 graph = graph_builder.compile()
 
@@ -76,61 +166,53 @@ if len(sys.argv) < 2:
 
 customer_email = sys.argv[1]
 
-print("\n" + "=" * 50)
-print(f"Finding invoices for: {customer_email}")
-print("=" * 50)
-
-response = graph.invoke(
-    {"messages": [{"role": "user", "content": f"Find all invoices for {customer_email}"}]})
-
-# Extract and display customer and invoice information
-customer_info = None
+if os.getenv("SKIP_LLM_PROBE") != "1":
+    _probe()
 
-for m in response['messages']:
-    if hasattr(m, 'content') and isinstance(m.content, list):
-        for item in m.content:
-            if isinstance(item, dict) and item.get('type') == 'mcp_call' and item.get('output'):
-                try:
-                    output_data = json.loads(item['output'])
-
-                    # Customer search results
-                    if 'results' in output_data and output_data.get('results'):
-                        customer_info = output_data['results'][0]
-                        print("\n" + "=" * 50)
-                        print("CUSTOMER INFORMATION")
-                        print("=" * 50)
-                        print(f"\nCustomer ID:   {customer_info.get('customerId', 'N/A')}")
-                        print(f"Company Name:  {customer_info.get('companyName', 'N/A')}")
-                        print(f"Contact Name:  {customer_info.get('contactName', 'N/A')}")
-                        print(f"Contact Email: {customer_info.get('contactEmail', 'N/A')}")
-                        print("=" * 50)
-
-                    # Invoice data
-                    if 'data' in output_data and output_data.get('data'):
-                        invoices = output_data['data']
-                    elif 'invoices' in output_data and output_data.get('invoices'):
-                        invoices = output_data['invoices']
-                    else:
-                        invoices = None
-
-                    if invoices:
-                        print("\n" + "=" * 50)
-                        print("INVOICE HISTORY")
-                        print("=" * 50)
-
-                        for idx, invoice in enumerate(invoices, 1):
-                            print(f"\nInvoice #{idx}:")
-                            print(f"  Invoice ID:     {invoice.get('id', invoice.get('invoiceId', 'N/A'))}")
-                            print(f"  Invoice Number: {invoice.get('invoiceNumber', 'N/A')}")
-                            print(f"  Invoice Date:   {invoice.get('invoiceDate', 'N/A')}")
-                            print(f"  Status:         {invoice.get('status', 'N/A')}")
-                            print(f"  Total Amount:   ${invoice.get('totalAmount', invoice.get('amount', 'N/A'))}")
-
-                        print("\n" + "=" * 50)
-                        print(f"Total Invoices: {len(invoices)}")
-                        print("=" * 50 + "\n")
-                except json.JSONDecodeError:
-                    print("Could not parse tool output")
-
-            elif isinstance(item, dict) and item.get('type') == 'text':
-                print(f"\nAssistant: {item.get('text', '')}\n")
+print("\n" + _BANNER)
+print(f"Finding invoices for: {customer_email}")
+print(_BANNER)
+
+response = graph.invoke({"email": customer_email, "result": InvoiceList()})
+
+# Display customer and invoice information
+result: InvoiceList = response["result"]
+customer_info = result.customer
+
+if customer_info:
+    print("\n" + _BANNER)
+    print("CUSTOMER INFORMATION")
+    print(_BANNER)
+    print("\n".join([
+        f"\nCustomer ID:   {customer_info.customerId}",
+        f"Company Name:  {customer_info.companyName or 'N/A'}",
+        f"Contact Name:  {customer_info.contactName or 'N/A'}",
+        f"Contact Email: {customer_info.contactEmail or 'N/A'}",
+    ]))
+    print(_BANNER)
+else:
+    print(f"\nNo customer found for: {customer_email}")
+
+if result.invoices:
+    print("\n" + _BANNER)
+    print("INVOICE HISTORY")
+    print(_BANNER)
+
+    for idx, invoice in enumerate(result.invoices, 1):
+        invoice_id = invoice.id if invoice.id is not None else invoice.invoiceId
+        total = invoice.totalAmount if invoice.totalAmount is not None else invoice.amount
+        print("\n".join([
+            f"\nInvoice #{idx}:",
+            f"  Invoice ID:     {invoice_id if invoice_id is not None else 'N/A'}",
+            f"  Invoice Number: {invoice.invoiceNumber or 'N/A'}",
+            f"  Invoice Date:   {invoice.invoiceDate or 'N/A'}",
+            f"  Status:         {invoice.status or 'N/A'}",
+            f"  Total Amount:   ${total if total is not None else 'N/A'}",
+        ]))
+
+    print("\n" + _BANNER)
+    print(f"Total Invoices: {len(result.invoices)}")
+    print(_BANNER + "\n")
+
+if response.get('summary'):
+    print(f"\nAssistant: {response['summary']}\n")
@@ -1,9 +1,15 @@
 import os
+import json
+import time
+import hashlib
 import logging
 import sys
+from operator import attrgetter
+from pathlib import Path
 from dotenv import load_dotenv
 from llama_stack_client import LlamaStackClient
 from llama_stack_client import APIConnectionError
+from llama_stack_client.types import Model
 
 # Configure logging
 logging.basicConfig(
@@ -22,12 +28,40 @@ load_dotenv()
 
 # Get configuration from environment
 LLAMA_STACK_BASE_URL = os.getenv("LLAMA_STACK_BASE_URL", "http://localhost:8321")
+# Seconds to reuse the cached model list; set MODELS_CACHE_TTL=0 to always fetch it
+MODELS_CACHE_TTL = float(os.getenv("MODELS_CACHE_TTL", "300"))
+_BANNER = "=" * 80
+_RULE = "-" * 80
 
-logger.info("=" * 80)
+# Model registry cache, one file per server
+cache_key = hashlib.blake2b(LLAMA_STACK_BASE_URL.encode(), digest_size=8).hexdigest()
+cache_path = Path.home() / ".cache" / "llama-stack" / f"models-{cache_key}.json"
+
+
+def load_cached_models():
+    """Return the cached model list, or None if missing or older than the TTL"""
+    try:
+        if time.time() - cache_path.stat().st_mtime > MODELS_CACHE_TTL:
+            return None
+        return [Model.construct(**m) for m in json.loads(cache_path.read_text())]
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_models(model_list):
+    """Write the model list to the cache file, ignoring write failures"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps([m.to_dict() for m in model_list]))
+    except OSError as e:
+        logger.debug(f"Could not write model cache: {e}")
+
+
+logger.info(_BANNER)
 logger.info("Available Embedding Models on Llama Stack Server")
-logger.info("=" * 80)
+logger.info(_BANNER)
 logger.info(f"Server: {LLAMA_STACK_BASE_URL}")
-logger.info("-" * 80)
+logger.info(_RULE)
 
 # Initialize client
 try:
@@ -38,44 +72,50 @@ except Exception as e:
 
 # List all models
 try:
-    logger.info("\nFetching available models...")
-    models = client.models.list()
-
-    model_list = list(models)
+    model_list = load_cached_models()
+    fetched = model_list is None
+    if fetched:
+        logger.info("\nFetching available models...")
+        model_list = list(client.models.list())
+    else:
+        logger.info(f"\nUsing cached model list ({cache_path}); set MODELS_CACHE_TTL=0 to refetch")
 
     if not model_list:
         logger.warning("No models found on the server")
         logger.info("\nYou need to register models using client.models.register()")
         sys.exit(0)
 
-    # Filter for embedding models only
-    embedding_models = []
-    for model in model_list:
-        model_type = getattr(model, 'model_type', 'unknown')
-        if model_type == 'embedding':
-            embedding_models.append(model)
+    # Filter for embedding models only, projecting just the fields we display
+    model_fields = attrgetter('identifier', 'provider_id', 'provider_resource_id', 'metadata')
+    embedding_models = [
+        model_fields(model)
+        for model in model_list
+        if getattr(model, 'model_type', 'unknown') == 'embedding'
+    ]
+
+    # Only cache a list worth reusing; after "none found" the user registers a
+    # model and re-runs, which must not be answered from the cache
+    if fetched and embedding_models:
+        save_cached_models(model_list)
 
     # Display Embedding Models
     if embedding_models:
         logger.info(f"\nFound {len(embedding_models)} embedding model(s):\n")
-        for i, model in enumerate(embedding_models, 1):
-            logger.info(f"{i}. {model.identifier}")
-            if hasattr(model, 'provider_id'):
-                logger.info(f"   Provider: {model.provider_id}")
-            if hasattr(model, 'provider_resource_id'):
-                logger.info(f"   Resource ID: {model.provider_resource_id}")
-            if hasattr(model, 'metadata'):
-                embedding_dim = model.metadata.get('embedding_dimension', 'unknown')
-                logger.info(f"   Dimension: {embedding_dim}")
-                if model.metadata.get('default_configured'):
-                    logger.info(f"   ⭐ Default configured")
+        for i, (identifier, provider_id, resource_id, metadata) in enumerate(embedding_models, 1):
+            logger.info(f"{i}. {identifier}")
+            logger.info(f"   Provider: {provider_id}")
+            logger.info(f"   Resource ID: {resource_id}")
+            md = metadata or {}
+            logger.info(f"   Dimension: {md.get('embedding_dimension', 'unknown')}")
+            if md.get('default_configured'):
+                logger.info(f"   ⭐ Default configured")
             logger.info("")
     else:
         logger.warning("\n⚠ No embedding models found!")
         logger.info("You need an embedding model for vector stores.")
         logger.info("Run: python 0_register_embedding_model.py")
 
-    logger.info("=" * 80)
+    logger.info(_BANNER)
 
 except APIConnectionError as e:
     logger.error(f"Cannot connect to server at {LLAMA_STACK_BASE_URL}")